@@ -2,5 +2,6 @@
 from .config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH, COCO_CLASSES
 from .preprocess import preprocess, preprocess_with_letterbox, restore_coords
 from .postprocess import yolov8_postprocess, nms, get_class_name
+from .draw import ResultDrawer, get_result_drawer
 from .camera import Camera, FPSCounter
 from .logger import zlog
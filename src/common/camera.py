@@ -4,31 +4,78 @@
 import cv2
 import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .config import OPENCV_NUM_THREADS
+
+# 限制 OpenCV 线程数，避免在板端少量 A 核上过度抢占
+cv2.setNumThreads(OPENCV_NUM_THREADS)
 
 
 class Camera:
     """摄像头封装类 - 支持多线程采集"""
     
-    def __init__(self, source=0, width=1280, height=720, fps=30):
+    def __init__(self, source=0, width=1280, height=720, fps=30, backend=None):
+        """
+        Args:
+            source: 设备号或视频路径/URL
+            width, height, fps: 采集参数
+            backend: None 使用 OpenCV 默认后端；'gstreamer' 使用
+                     v4l2src + appsink(drop, max-buffers=1) 管道（仅设备号有效）
+        """
         self.source = source
         self.width = width
         self.height = height
         self.fps = fps
+        self.backend = backend
         self.cap = None
-        self.frame = None
         self.running = False
         self.thread = None
         self.lock = threading.Lock()
+        
+        # 低延迟模式：采集线程只 grab()，read() 请求时才 retrieve() 解码
+        self._low_latency = False
+        self._need_frame = threading.Event()
+        self._frame_ready = threading.Event()
+        
+        # 双缓冲：采集线程写 _bufs[1 - _read_idx]，写完后切换 _read_idx
+        self._bufs = [None, None]
+        self._read_idx = 0
+        
+        # 帧序号：每存入一帧加 1，_store 时通知等待新帧的 frames()
+        self._frame_seq = 0
+        self._new_frame = threading.Condition(self.lock)
+        
+        # 预取：read_next_async() 在后台线程等待下一帧（按需创建）
+        self._prefetch = None
+    
+    def _create_capture(self):
+        """按 backend 创建 VideoCapture"""
+        if self.backend == 'gstreamer' and isinstance(self.source, int):
+            pipeline = (
+                f"v4l2src device=/dev/video{self.source} ! "
+                f"video/x-raw,width={self.width},height={self.height},framerate={self.fps}/1 ! "
+                "videoconvert ! appsink drop=true max-buffers=1 sync=false"
+            )
+            return cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        return cv2.VideoCapture(self.source)
     
     def open(self):
-        self.cap = cv2.VideoCapture(self.source)
+        self.cap = self._create_capture()
         if not self.cap.isOpened():
             raise RuntimeError(f"无法打开摄像头: {self.source}")
         
+        self._set_props()
+        return self
+    
+    def _set_props(self):
+        """设置分辨率/帧率，并尝试把驱动缓冲区限制为 1 帧"""
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
         self.cap.set(cv2.CAP_PROP_FPS, self.fps)
-        return self
+        # 后端不支持时回退到连续 read() 模式
+        self._low_latency = bool(self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1))
     
     def _capture_loop(self):
         """后台采集循环（带断线重连）"""
@@ -36,12 +83,19 @@ class Camera:
         max_retries = 5
         
         while self.running:
-            ret, frame = self.cap.read()
+            if self._low_latency:
+                # 持续 grab 丢弃旧帧，只在有读取请求时解码
+                ret = self.cap.grab()
+                if ret and self._need_frame.is_set():
+                    ret = self._store(self.cap.retrieve, self._bufs[1 - self._read_idx])
+                    if ret:
+                        self._need_frame.clear()
+                        self._frame_ready.set()
+            else:
+                ret = self._store(self.cap.read, self._bufs[1 - self._read_idx])
             
             if ret:
                 fail_count = 0  # 成功则重置计数
-                with self.lock:
-                    self.frame = frame
             else:
                 fail_count += 1
                 if fail_count >= max_retries:
@@ -51,16 +105,26 @@ class Camera:
                 else:
                     time.sleep(0.1)  # 短暂等待后重试
     
+    def _store(self, fetch, buf):
+        """解码到预分配的写缓冲区（尺寸不符时 OpenCV 会重新分配），成功后切换读写缓冲区"""
+        ret, frame = fetch(buf)
+        if ret:
+            with self.lock:
+                w = 1 - self._read_idx
+                self._bufs[w] = frame
+                self._read_idx = w
+                self._frame_seq += 1
+                self._new_frame.notify_all()
+        return ret
+    
     def _reconnect(self):
         """重新连接摄像头"""
         try:
             if self.cap:
                 self.cap.release()
             time.sleep(0.5)
-            self.cap = cv2.VideoCapture(self.source)
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+            self.cap = self._create_capture()
+            self._set_props()
         except Exception:
             time.sleep(1.0)  # 重连失败，等待后继续
     
@@ -73,12 +137,89 @@ class Camera:
         time.sleep(0.1)
         return self
     
-    def read(self):
+    def read(self, timeout=0.5, copy=False):
+        """
+        读取最新一帧
+        
+        低延迟模式下请求采集线程解码下一帧并等待（最多 timeout 秒），
+        超时则返回上一帧
+        
+        ⚠️ 低延迟模式下默认返回内部缓冲区（零拷贝），下下次 read() 时会被覆盖；
+        需要跨帧保存或交给其他线程时传 copy=True
+        """
+        if self._low_latency and self.running:
+            self._frame_ready.clear()
+            self._need_frame.set()
+            self._frame_ready.wait(timeout)
+        
         with self.lock:
-            return self.frame.copy() if self.frame is not None else None
+            frame = self._bufs[self._read_idx]
+            if frame is None or (self._low_latency and not copy):
+                return frame
+            # 连续采集模式下采集线程可能很快覆盖该缓冲区，仍需拷贝
+            return frame.copy()
+    
+    def read_next_async(self, timeout=0.5, copy=False):
+        """
+        异步读取下一帧，立即返回 Future，结果同 read()
+        
+        低延迟模式下 read() 要等采集线程解码，在推理当前帧之前调用可让等待/解码与推理并行；
+        同一时刻只应有一个未完成的预取（零拷贝时，保留当前帧 + 预取一帧恰好用满双缓冲）
+        连续采集模式下 read() 不等待，直接同步读取并返回已完成的 Future
+        """
+        if not self._low_latency:
+            future = Future()
+            future.set_result(self.read(timeout, copy))
+            return future
+        if self._prefetch is None:
+            self._prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cam-prefetch")
+        return self._prefetch.submit(self.read, timeout, copy)
+    
+    def _wait_new_frame(self, last_seq, timeout):
+        """
+        等待序号不同于 last_seq 的帧，返回 (帧拷贝, 序号)
+        
+        超时或采集停止时返回 (None, last_seq)
+        """
+        with self._new_frame:
+            self._new_frame.wait_for(
+                lambda: self._frame_seq != last_seq or not self.running, timeout
+            )
+            frame = self._bufs[self._read_idx]
+            if self._frame_seq == last_seq or frame is None:
+                return None, last_seq
+            return frame.copy(), self._frame_seq
+    
+    def frames(self, timeout=0.5, copy=False):
+        """
+        逐帧读取的生成器（采集停止时结束）
+        
+        低延迟模式下预取：产出当前帧的同时已请求下一帧；
+        连续采集模式下等采集线程存入新帧后产出（总是拷贝），不重复产出同一帧，
+        不预取（预取只会让帧更旧）；timeout 秒内没有新帧时产出 None，便于调用方检查退出标志
+        """
+        if not self._low_latency:
+            seq = 0
+            while self.running:
+                frame, seq = self._wait_new_frame(seq, timeout)
+                if not self.running:
+                    return
+                yield frame
+            return
+        
+        pending = self.read_next_async(timeout, copy)
+        while self.running:
+            frame = pending.result()
+            pending = self.read_next_async(timeout, copy)
+            yield frame
     
     def stop(self):
         self.running = False
+        with self._new_frame:
+            self._new_frame.notify_all()
+        if self._prefetch is not None:
+            self._prefetch.shutdown(wait=True)
+            self._prefetch = None
         if self.thread:
             self.thread.join(timeout=1.0)
     
@@ -97,13 +238,11 @@ class Camera:
 class FPSCounter:
     """FPS 计数器"""
     def __init__(self, window=30):
-        self.times = []
+        self.times = deque(maxlen=window)
         self.window = window
     
     def tick(self):
         self.times.append(time.time())
-        if len(self.times) > self.window:
-            self.times.pop(0)
     
     def get_fps(self):
         if len(self.times) < 2:
@@ -11,6 +11,36 @@
 # ⚠️ 预处理和后处理必须使用相同的尺寸
 MODEL_INPUT_SIZE = (640, 640)
 
+# RKNN 模型输入通道顺序是否为 BGR
+# True 时 RKNN 检测器跳过预处理中的 BGR→RGB，直接送入摄像头的 BGR 图像
+# ⚠️ 仅当 .rknn 按 BGR 输入导出时才能开启（例如转换前在 ONNX 中交换首层卷积
+#    权重的输入通道顺序），否则 R/B 通道颠倒会导致精度下降
+# ⚠️ rknn.config(quant_img_RGB2BGR=True) 只影响量化校准图片的读取，不会改变运行时的输入通道顺序
+# ONNX 检测器不受此项影响（模型为 RGB 输入，通道倒序在转 NCHW 时一并完成）
+RKNN_INPUT_BGR = False
+
+# RKNN 输入直通（inference 的 inputs_pass_through）
+# 开启后运行时不再对输入做归一化/量化/排布转换，letterbox 输出的 uint8 NHWC 缓冲区原样送入 NPU
+# ⚠️ 仅当模型输入张量本身就是 uint8 NHWC 时才能开启：导出时用
+#    rknn.config(mean_values=[[0, 0, 0]], std_values=[[255, 255, 255]]) 把归一化折叠进模型，
+#    并在板端确认输入 tensor 的类型与排布；否则保持 False，由运行时完成转换
+RKNN_INPUT_PASS_THROUGH = False
+
+# 多 NPU 核并行：每个掩码创建一个 RKNN 实例，推理请求分发给空闲实例（摄像头模式）
+# None 表示单实例；RK3576 双核建议 (1, 2)，即 NPU_CORE_0 / NPU_CORE_1
+NPU_CORE_MASKS = None
+
+# ONNX Runtime 执行后端优先级（PC 端），按顺序选用当前环境可用的第一个
+ONNX_PROVIDERS = (
+    "CUDAExecutionProvider",
+    "OpenVINOExecutionProvider",
+    "CPUExecutionProvider",
+)
+
+# 缩小图像时的插值方式："linear" 或 "area"（放大始终使用 linear）
+# area 抗锯齿效果更好，但在部分 OpenCV 构建上非整数倍缩小明显更慢，请在板端实测后选择
+RESIZE_DOWNSCALE_INTERP = "linear"
+
 # ==================== YOLOv8 检测配置 ====================
 
 # 置信度阈值：低于此值的检测框被丢弃
@@ -19,6 +49,10 @@ OBJ_THRESH = 0.25
 # NMS 阈值：IoU 高于此值的重叠框被合并
 NMS_THRESH = 0.45
 
+# DFL 快速解码：只对最大概率 bin 及其相邻两个 bin 做 softmax 求期望
+# 省去整张量 exp，板端后处理更快；框坐标存在少量近似误差，默认关闭
+DFL_FAST_DECODE = False
+
 # ==================== 摄像头配置 ====================
 # ⚠️ 摄像头原始分辨率（≠ 模型输入尺寸）
 # 图像会先从摄像头采集，再 resize 到 MODEL_INPUT_SIZE
@@ -33,6 +67,24 @@ CAMERA_HEIGHT = 720
 # 帧率
 CAMERA_FPS = 30
 
+# 采集后端：None = OpenCV 默认，'gstreamer' = v4l2src 单帧缓冲管道
+CAMERA_BACKEND = None
+
+# OpenCV 线程数（resize/cvtColor 等），板端避免线程过多
+OPENCV_NUM_THREADS = 2
+
+# 进程 CPU 亲和性：None 表示不绑定
+# RK3576 板端建议 (4, 5, 6, 7)，即 A72 大核，避免预处理被调度到 A53 小核
+CPU_AFFINITY = None
+
+# 静止画面跳帧：8x8 灰度缩略图与上次推理帧的平均绝对差低于该值时复用上次结果
+# 设为 0 关闭
+FRAME_DIFF_THRESH = 2.0
+
+# 最多连续复用的帧数，超过后强制推理一次
+# 小目标只改变个别缩略图像素时平均差可能低于阈值，靠此项保证最迟 N+1 帧内被检测到
+FRAME_MAX_SKIP = 10
+
 # ==================== 跌倒检测配置 ====================
 
 # 判断窗口帧数
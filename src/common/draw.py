@@ -0,0 +1,169 @@
+"""
+检测结果绘制 - 各检测器共用
+
+标签（类别名 + 分数）预先渲染成贴图，每帧只做 ROI 拷贝，不再逐帧光栅化文字
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from .config import COCO_CLASSES
+from .postprocess import get_class_name
+
+# 标签样式：高 21 像素（y1-20 ~ y1），文字基线在第 15 行
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_FONT_SCALE = 0.6
+_LABEL_H = 21
+_LABEL_BASE = 15
+
+
+@lru_cache(maxsize=256)
+def _text_width(text):
+    """文字宽度（像素），字体参数固定，按文字缓存"""
+    return cv2.getTextSize(text, _FONT, _FONT_SCALE, 1)[0][0]
+
+
+def _clip(img, h, w, x, y):
+    """计算 (x, y) 处 h x w 区域与图像的交集，返回 (图像切片, 区域内切片)，无交集返回 None"""
+    img_h, img_w = img.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, img_w), min(y + h, img_h)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (slice(y0, y1), slice(x0, x1)), (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+
+def _blit(img, patch, x, y):
+    """把 patch 贴到 img 的 (x, y) 处，超出图像的部分裁掉"""
+    roi = _clip(img, patch.shape[0], patch.shape[1], x, y)
+    if roi is not None:
+        img[roi[0]] = patch[roi[1]]
+
+
+def _stamp(img, mask, x, y, value=255):
+    """按掩码把 img 的 (x, y) 处像素置为 value，超出图像的部分裁掉"""
+    roi = _clip(img, mask.shape[0], mask.shape[1], x, y)
+    if roi is not None:
+        np.copyto(img[roi[0]], value, where=mask[roi[1]])
+
+
+class ResultDrawer:
+    """检测结果绘制器：类别颜色表、类别名贴图、分数掩码均在初始化时生成"""
+
+    def __init__(self):
+        # 类别颜色表预先生成（按类别 ID 播种，且不改动全局随机状态）
+        self._palette = [self._make_color(c) for c in range(len(COCO_CLASSES))]
+
+        # 类别名贴图 + 0.00~1.00 分数掩码
+        self._label_sprites = {}
+        for class_id, name in enumerate(COCO_CLASSES):
+            color = self._palette[class_id]
+            self._label_sprites[(name, color)] = self._render_label(name, color)
+        self._score_masks = self._render_scores()
+
+    def draw(self, img, boxes, classes, scores, names=None):
+        """在图像上绘制检测结果（直接在 img 上绘制，需要保留原图时由调用方先 copy）"""
+        if boxes is None:
+            return img
+
+        # 整体转换一次坐标和类别，避免逐框 map(int, ...)
+        boxes_i = boxes.astype(np.int32).tolist()
+        classes_i = np.asarray(classes).astype(np.int32).tolist()
+
+        for i, ((x1, y1, x2, y2), cls, score) in enumerate(zip(boxes_i, classes_i, scores)):
+            name = names[i] if names else get_class_name(cls)
+
+            # 不同类别用不同颜色
+            color = self._get_color(cls)
+
+            # 画框
+            cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
+
+            # 画标签：类别名贴图 + 分数掩码
+            sprite, score_x = self._get_label(name, color)
+            _blit(img, sprite, x1, y1 - 20)
+
+            text = f"{score:.2f}"
+            mask = self._score_masks.get(text)
+            if mask is not None:
+                _stamp(img, mask, x1 + score_x, y1 - 20)
+            else:
+                cv2.putText(img, text, (x1 + score_x, y1 - 5),
+                           _FONT, _FONT_SCALE, (255, 255, 255), 1)
+
+        return img
+
+    def _get_label(self, name, color):
+        """获取类别名贴图，按 (名称, 颜色) 缓存，保证标签背景与框颜色一致；未缓存的组合按需渲染"""
+        key = (name, color)
+        label = self._label_sprites.get(key)
+        if label is None:
+            label = self._render_label(name, color)
+            self._label_sprites[key] = label
+        return label
+
+    @staticmethod
+    def _render_label(name, color):
+        """
+        渲染类别名贴图，背景宽度按 "name: 0.00" 预留分数位置
+
+        Returns:
+            (贴图, 分数起始 x)
+        """
+        prefix = f"{name}: "
+        w = _text_width(prefix + "0.00") + 1
+        sprite = np.empty((_LABEL_H, w, 3), dtype=np.uint8)
+        sprite[:] = color
+        cv2.putText(sprite, prefix, (0, _LABEL_BASE), _FONT, _FONT_SCALE, (255, 255, 255), 1)
+        # 分数起点取前缀的步进宽度，与整串渲染时的字符位置一致
+        score_x = _text_width(prefix + "0") - _text_width("0")
+        return sprite, score_x
+
+    @staticmethod
+    def _render_scores():
+        """由数字字形拼出 "0.00" ~ "1.00" 的文字掩码：{文字: (h, w, 3) bool}"""
+        glyphs = {}
+        for ch in "0123456789.":
+            w = _text_width(ch)
+            canvas = np.zeros((_LABEL_H, w), dtype=np.uint8)
+            cv2.putText(canvas, ch, (0, _LABEL_BASE), _FONT, _FONT_SCALE, 255, 1)
+            # 抗锯齿渲染时取半覆盖以上的像素，避免字形发粗
+            glyphs[ch] = (canvas >= 128, _text_width(ch + ch) - w)
+
+        masks = {}
+        width = _text_width("0.00") + 1
+        for i in range(101):
+            text = f"{i / 100:.2f}"
+            mask = np.zeros((_LABEL_H, width), dtype=np.bool_)
+            x = 0
+            for ch in text:
+                glyph, advance = glyphs[ch]
+                mask[:, x:x + glyph.shape[1]] |= glyph
+                x += advance
+            masks[text] = np.repeat(mask[:, :, None], 3, axis=2)
+        return masks
+
+    def _get_color(self, class_id):
+        """根据类别 ID 获取颜色：COCO 类别查表，其余按整数哈希生成（无 PRNG、无数组分配）"""
+        if 0 <= class_id < len(self._palette):
+            return self._palette[class_id]
+        # Knuth 乘法哈希，取低 24 位拆成三个通道
+        h = (class_id * 2654435761) & 0xFFFFFF
+        return (h >> 16, (h >> 8) & 0xFF, h & 0xFF)
+
+    @staticmethod
+    def _make_color(class_id):
+        """根据类别 ID 生成颜色"""
+        return tuple(np.random.RandomState(class_id).randint(0, 255, 3).tolist())
+
+
+_shared_drawer = None
+
+
+def get_result_drawer():
+    """进程内共享的绘制器（首次调用时创建），多个检测器实例共用一份贴图"""
+    global _shared_drawer
+    if _shared_drawer is None:
+        _shared_drawer = ResultDrawer()
+    return _shared_drawer
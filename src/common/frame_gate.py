@@ -0,0 +1,57 @@
+"""
+静止画面跳帧 - 画面基本不变时复用上次检测结果，减少 NPU 推理次数
+"""
+import cv2
+import numpy as np
+
+from .config import FRAME_DIFF_THRESH, FRAME_MAX_SKIP
+
+
+def _frame_thumb(frame):
+    """8x8 灰度缩略图（先缩小再转灰度，只处理 64 个像素）"""
+    small = cv2.resize(frame, (8, 8), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+
+class FrameDiffGate:
+    """
+    跳帧判断：与上次推理帧的缩略图比较（而不是上一帧），缓慢变化累积到阈值后仍会重新推理；
+    连续跳过 max_skip 帧后强制推理一次，避免小目标变化低于阈值时永远检测不到
+    """
+
+    def __init__(self, diff_thresh=FRAME_DIFF_THRESH, max_skip=FRAME_MAX_SKIP):
+        """
+        Args:
+            diff_thresh: 平均绝对差阈值，<= 0 关闭跳帧
+            max_skip: 最多连续跳过的帧数
+        """
+        self.diff_thresh = diff_thresh
+        self.max_skip = max_skip
+        self._ref = None
+        self._pending = None
+        self._skipped = 0
+
+    def should_skip(self, frame):
+        """返回 True 表示本帧可复用上次结果；返回 False 时推理成功后需调用 mark_inferred()"""
+        if self.diff_thresh <= 0:
+            return False
+
+        thumb = _frame_thumb(frame)
+        if (self._ref is not None and self._skipped < self.max_skip
+                and np.abs(thumb - self._ref).mean() < self.diff_thresh):
+            self._skipped += 1
+            return True
+
+        self._pending = thumb
+        return False
+
+    def mark_inferred(self):
+        """推理成功：把刚才判断的帧作为新的参考帧"""
+        self._ref = self._pending
+        self._skipped = 0
+
+    def reset(self):
+        """清除参考帧（例如推理失败后），下一帧必定推理"""
+        self._ref = None
+        self._pending = None
+        self._skipped = 0
@@ -35,24 +35,38 @@ class ZLogWrapper:
             raise RuntimeError(f"zlog get category failed: {category}")
         
         self._category = category
+        
+        # 预先解析 ctypes 函数，避免每次调用的属性查找
+        self._debug = self.zlog.zlog_debug
+        self._info = self.zlog.zlog_info
+        self._warn = self.zlog.zlog_warn
+        self._error = self.zlog.zlog_error
+        self._fatal = self.zlog.zlog_fatal
+    
+    def _emit(self, fn, msg):
+        """bytes 直接透传，其余转为字符串后编码"""
+        if isinstance(msg, (bytes, bytearray)):
+            fn(self.zc, bytes(msg))
+        else:
+            fn(self.zc, str(msg).encode())
     
     def debug(self, msg):
-        self.zlog.zlog_debug(self.zc, str(msg).encode())
+        self._emit(self._debug, msg)
     
     def info(self, msg):
-        self.zlog.zlog_info(self.zc, str(msg).encode())
+        self._emit(self._info, msg)
     
     def warn(self, msg):
-        self.zlog.zlog_warn(self.zc, str(msg).encode())
+        self._emit(self._warn, msg)
     
     def warning(self, msg):
         self.warn(msg)
     
     def error(self, msg):
-        self.zlog.zlog_error(self.zc, str(msg).encode())
+        self._emit(self._error, msg)
     
     def fatal(self, msg):
-        self.zlog.zlog_fatal(self.zc, str(msg).encode())
+        self._emit(self._fatal, msg)
 
 
 class ColoredLogger:
@@ -72,6 +86,11 @@ class ColoredLogger:
     }
     
     def __init__(self, name="rk3576", level=logging.INFO, log_file=None):
+        # 终端检测只做一次，颜色前缀/后缀按级别预先生成
+        self._isatty = sys.stdout.isatty()
+        self._prefixes = {lvl: (color if self._isatty else '') for lvl, color in self.COLORS.items()}
+        self._reset = self._prefixes['RESET']
+        
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
         self.logger.handlers.clear()
@@ -99,10 +118,8 @@ class ColoredLogger:
     
     def _colorize(self, level, msg):
         """给消息添加颜色（仅终端）"""
-        if sys.stdout.isatty():
-            color = self.COLORS.get(level, '')
-            reset = self.COLORS['RESET']
-            return f"{color}{msg}{reset}"
+        if self._isatty:
+            return f"{self._prefixes.get(level, '')}{msg}{self._reset}"
         return msg
     
     def debug(self, msg):
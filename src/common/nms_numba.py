@@ -0,0 +1,64 @@
+"""
+NMS 加速内核 - Numba JIT（可选依赖）
+
+未安装 numba 时 HAS_NUMBA = False，postprocess.nms 自动回退到纯 numpy 实现
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+
+    @njit
+    def nms_kernel(x1, y1, x2, y2, order, iou_threshold):
+        """
+        NMS 内核：逐个遍历候选框，用 suppressed 标记代替数组收缩
+
+        Args:
+            x1, y1, x2, y2: 框坐标，float64 连续数组
+            order: 按得分降序排列的索引
+            iou_threshold: IoU 阈值
+
+        Returns:
+            保留的框索引（int32）
+        """
+        n = order.shape[0]
+        suppressed = np.zeros(n, dtype=np.bool_)
+        keep = np.empty(n, dtype=np.int32)
+        num_keep = 0
+        # 面积预先算好，内层循环只做比较和乘加
+        # 不开 fastmath：保持与 numpy 实现逐位一致的 IoU 判定
+        areas = (x2 - x1) * (y2 - y1)
+
+        for _i in range(n):
+            if suppressed[_i]:
+                continue
+            i = order[_i]
+            keep[num_keep] = i
+            num_keep += 1
+
+            for _j in range(_i + 1, n):
+                if suppressed[_j]:
+                    continue
+                j = order[_j]
+                # 与 numpy 实现保持一致的 1e-5 偏置
+                w = max(0.0, min(x2[i], x2[j]) - max(x1[i], x1[j]) + 0.00001)
+                h = max(0.0, min(y2[i], y2[j]) - max(y1[i], y1[j]) + 0.00001)
+                inter = w * h
+                if inter / (areas[i] + areas[j] - inter) > iou_threshold:
+                    suppressed[_j] = True
+
+        return keep[:num_keep]
+
+    # 导入时预热一次，避免首帧触发 JIT 编译卡顿
+    _dummy = np.array([0.0, 1.0], dtype=np.float64)
+    nms_kernel(_dummy, _dummy, _dummy + 1, _dummy + 1, np.array([0, 1], dtype=np.int64), 0.5)
+    del _dummy
+
+else:
+    nms_kernel = None
@@ -1,73 +1,98 @@
 """
-YOLO 后处理模块 - YOLOv8 完整实现（纯 numpy，无 torch 依赖）
+YOLO 后处理模块 - YOLOv8 完整实现（numpy + OpenCV，无 torch 依赖）
 参考：rknn_model_zoo/examples/yolov8/python/yolov8.py
 """
+import cv2
 import numpy as np
-from .config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH, COCO_CLASSES
+from .config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH, COCO_CLASSES, DFL_FAST_DECODE
+from .nms_numba import HAS_NUMBA, nms_kernel
 
+# 类别坐标偏移量，需大于任意检测框坐标（batched NMS 使用）
+_CLASS_OFFSET = 7680.0
 
-def _softmax(x, axis=2):
-    """Numpy 实现的 softmax"""
-    x_exp = np.exp(x - np.max(x, axis=axis, keepdims=True))
-    return x_exp / np.sum(x_exp, axis=axis, keepdims=True)
+
+# 网格/步长缓存：模型输入尺寸和检测头尺寸固定，无需每帧重建
+_GRID_CACHE = {}
+_ACC_CACHE = {}
+
+
+def _get_grid(grid_h, grid_w, img_size):
+    """
+    获取网格中心和步长，按 (grid_h, grid_w, img_size) 缓存
+    
+    Returns:
+        centers: (grid_h * grid_w, 2) 各位置的网格中心 (col + 0.5, row + 0.5)，按行优先展平
+        stride: (2,) x/y 方向步长
+    """
+    key = (grid_h, grid_w, tuple(img_size))
+    cached = _GRID_CACHE.get(key)
+    if cached is None:
+        col, row = np.meshgrid(np.arange(0, grid_w), np.arange(0, grid_h))
+        centers = np.stack((col.reshape(-1), row.reshape(-1)), axis=1) + 0.5
+        stride = np.array([img_size[1] // grid_h, img_size[0] // grid_w])
+        cached = _GRID_CACHE[key] = (centers, stride)
+    return cached
 
 
 def _dfl(position):
     """
     Distribution Focal Loss (DFL) - 解码边界框
     ✅ 纯 numpy 实现，板端友好
+    
+    softmax 原地计算，与加权求和（einsum）融合，减少对大张量的遍历次数
     """
     n, c, h, w = position.shape
     p_num = 4
     mc = c // p_num
-    y = position.reshape(n, p_num, mc, h, w)
+    x = position.reshape(n, p_num, mc, h, w)
     
-    # softmax (numpy 实现)
-    y = _softmax(y, axis=2)
+    if DFL_FAST_DECODE:
+        return _dfl_top3(x)
     
-    # 加权求和
-    acc_metrix = np.arange(mc).astype(np.float32).reshape(1, 1, mc, 1, 1)
-    y = np.sum(y * acc_metrix, axis=2)
-    return y
-
-
-def _box_process(position, img_size=None):
-    """将模型输出转换为 xyxy 坐标"""
-    if img_size is None:
-        img_size = MODEL_INPUT_SIZE
+    # softmax：减最大值时写入新缓冲区（不修改模型输出），后续原地计算
+    y = np.subtract(x, x.max(axis=2, keepdims=True), dtype=np.float32)
+    np.exp(y, out=y)
+    y /= y.sum(axis=2, keepdims=True)
     
-    grid_h, grid_w = position.shape[2:4]
-    col, row = np.meshgrid(np.arange(0, grid_w), np.arange(0, grid_h))
-    col = col.reshape(1, 1, grid_h, grid_w)
-    row = row.reshape(1, 1, grid_h, grid_w)
-    grid = np.concatenate((col, row), axis=1)
-    stride = np.array([img_size[1] // grid_h, img_size[0] // grid_w]).reshape(1, 2, 1, 1)
-
-    position = _dfl(position)
-    box_xy = grid + 0.5 - position[:, 0:2, :, :]
-    box_xy2 = grid + 0.5 + position[:, 2:4, :, :]
-    xyxy = np.concatenate((box_xy * stride, box_xy2 * stride), axis=1)
-
-    return xyxy
+    # 加权求和
+    acc_metrix = _ACC_CACHE.get(mc)
+    if acc_metrix is None:
+        acc_metrix = _ACC_CACHE[mc] = np.arange(mc, dtype=np.float32)
+    return np.einsum('npchw,c->nphw', y, acc_metrix)
 
 
-def _filter_boxes(boxes, box_confidences, box_class_probs, obj_thresh=None):
-    """过滤低置信度的检测框"""
-    if obj_thresh is None:
-        obj_thresh = OBJ_THRESH
+def _dfl_top3(x):
+    """
+    DFL 近似解码：取概率最大的 bin k，只对 k-1/k/k+1 三个 bin 做 softmax 求期望
     
-    box_confidences = box_confidences.reshape(-1)
+    Args:
+        x: DFL logits (n, 4, mc, h, w)
+    """
+    mc = x.shape[2]
+    k = np.argmax(x, axis=2)[:, :, None]
+    # 窗口中心限制在 [1, mc-2]，保证三个 bin 都在范围内且包含最大值
+    center = np.clip(k, 1, mc - 2)
+    idx = np.concatenate((center - 1, center, center + 1), axis=2)
     
-    class_max_score = np.max(box_class_probs, axis=-1)
-    classes = np.argmax(box_class_probs, axis=-1)
+    y = np.take_along_axis(x, idx, axis=2).astype(np.float32)
+    y -= y.max(axis=2, keepdims=True)
+    np.exp(y, out=y)
+    y /= y.sum(axis=2, keepdims=True)
+    return np.sum(y * idx, axis=2, dtype=np.float32)
 
-    _class_pos = np.where(class_max_score * box_confidences >= obj_thresh)
-    scores = (class_max_score * box_confidences)[_class_pos]
 
-    boxes = boxes[_class_pos]
-    classes = classes[_class_pos]
-
-    return boxes, classes, scores
+def _decode_boxes(logits, pos, grid_h, grid_w, img_size):
+    """
+    只对通过阈值的候选框做 DFL 解码并转换为 xyxy 坐标
+    
+    Args:
+        logits: 候选框的 DFL logits (k, 4 * mc)
+        pos: 候选框在该检测头内的展平位置 (k,)
+    """
+    centers, stride = _get_grid(grid_h, grid_w, img_size)
+    dist = _dfl(logits[:, :, None, None])[:, :, 0, 0]
+    xy = centers[pos]
+    return np.concatenate(((xy - dist[:, 0:2]) * stride, (xy + dist[:, 2:4]) * stride), axis=1)
 
 
 def nms(boxes, scores, iou_threshold=None):
@@ -78,12 +103,23 @@ def nms(boxes, scores, iou_threshold=None):
     if len(boxes) == 0:
         return np.array([])
     
-    x = boxes[:, 0]
-    y = boxes[:, 1]
-    w = boxes[:, 2] - boxes[:, 0]
-    h = boxes[:, 3] - boxes[:, 1]
+    if HAS_NUMBA:
+        # float64：batched NMS 的类别偏移可达 6e5，float32 会丢失亚像素精度
+        b = np.ascontiguousarray(boxes, dtype=np.float64)
+        order = scores.argsort()[::-1]
+        return nms_kernel(
+            np.ascontiguousarray(b[:, 0]), np.ascontiguousarray(b[:, 1]),
+            np.ascontiguousarray(b[:, 2]), np.ascontiguousarray(b[:, 3]),
+            np.ascontiguousarray(order), float(iou_threshold)
+        )
+    
+    x1 = boxes[:, 0]
+    y1 = boxes[:, 1]
+    x2 = boxes[:, 2]
+    y2 = boxes[:, 3]
 
-    areas = w * h
+    # 面积只算一次；每轮只对剩余候选框 gather 一次，其余为广播运算
+    areas = (x2 - x1) * (y2 - y1)
     order = scores.argsort()[::-1]
 
     keep = []
@@ -94,31 +130,53 @@ def nms(boxes, scores, iou_threshold=None):
         if order.size == 1:
             break
 
-        xx1 = np.maximum(x[i], x[order[1:]])
-        yy1 = np.maximum(y[i], y[order[1:]])
-        xx2 = np.minimum(x[i] + w[i], x[order[1:]] + w[order[1:]])
-        yy2 = np.minimum(y[i] + h[i], y[order[1:]] + h[order[1:]])
+        rest = order[1:]
+        xx1 = np.maximum(x1[i], x1[rest])
+        yy1 = np.maximum(y1[i], y1[rest])
+        xx2 = np.minimum(x2[i], x2[rest])
+        yy2 = np.minimum(y2[i], y2[rest])
 
-        w1 = np.maximum(0.0, xx2 - xx1 + 0.00001)
-        h1 = np.maximum(0.0, yy2 - yy1 + 0.00001)
-        inter = w1 * h1
+        inter = np.maximum(0.0, xx2 - xx1 + 0.00001) * np.maximum(0.0, yy2 - yy1 + 0.00001)
+        ovr = inter / (areas[i] + areas[rest] - inter)
+        order = rest[ovr <= iou_threshold]
 
-        ovr = inter / (areas[i] + areas[order[1:]] - inter)
-        inds = np.where(ovr <= iou_threshold)[0]
-        order = order[inds + 1]
+    return np.asarray(keep)
 
-    return np.array(keep)
 
+def _batched_nms(boxes, scores, classes, iou_threshold):
+    """
+    按类别 NMS（不同类别的框互不抑制）
+    
+    Numba 可用时：给每个类别加不同坐标偏移后做一次全局 NMS（torchvision coordinate trick）
+    否则优先用 OpenCV 的 C++ 实现 cv2.dnn.NMSBoxesBatched，最后回退到纯 numpy
+    """
+    if HAS_NUMBA or not hasattr(cv2.dnn, 'NMSBoxesBatched'):
+        offsets = classes.astype(np.float32) * _CLASS_OFFSET
+        return nms(boxes + offsets[:, None], scores, iou_threshold)
+    
+    xywh = np.concatenate((boxes[:, :2], boxes[:, 2:] - boxes[:, :2]), axis=1)
+    keep = cv2.dnn.NMSBoxesBatched(
+        xywh, scores.astype(np.float32), classes.astype(np.int32), 0.0, float(iou_threshold)
+    )
+    return np.asarray(keep, dtype=np.int64).reshape(-1)
 
-def yolov8_postprocess(outputs, obj_thresh=None, nms_thresh=None, img_size=None):
+
+def _dequant(q, scale, zp):
+    """int8/uint8 量化值反量化为 float32"""
+    return (q.astype(np.float32) - zp) * np.float32(scale)
+
+
+def yolov8_postprocess(outputs, obj_thresh=None, nms_thresh=None, img_size=None, quant_params=None):
     """
-    YOLOv8 后处理完整实现（纯 numpy，板端友好）
+    YOLOv8 后处理完整实现（numpy，板端友好）
     
     Args:
         outputs: 模型输出（多个 tensor）
         obj_thresh: 置信度阈值，默认使用 config.OBJ_THRESH
         nms_thresh: NMS 阈值，默认使用 config.NMS_THRESH
         img_size: 输入图像尺寸，默认使用 config.MODEL_INPUT_SIZE
+        quant_params: 量化输出的 [(scale, zp), ...]，与 outputs 一一对应；
+            传入时 outputs 为未反量化的 int8 张量，阈值在量化域比较，只反量化通过阈值的候选框
     
     Returns:
         boxes: 检测框坐标 [[x1,y1,x2,y2], ...]
@@ -132,52 +190,51 @@ def yolov8_postprocess(outputs, obj_thresh=None, nms_thresh=None, img_size=None)
     if img_size is None:
         img_size = MODEL_INPUT_SIZE
     
-    boxes, scores, classes_conf = [], [], []
     default_branch = 3
     pair_per_branch = len(outputs) // default_branch
 
-    # 处理 3 个不同尺度的输出
+    # 处理 3 个不同尺度的输出：先在 NCHW 上按类别最高分过滤，
+    # 只对通过阈值的候选框做 argmax 和 DFL 解码（通常不到 1%），避免整张量的转置和 softmax
+    boxes, classes, scores = [], [], []
     for i in range(default_branch):
-        boxes.append(_box_process(outputs[pair_per_branch * i], img_size))
-        classes_conf.append(outputs[pair_per_branch * i + 1])
-        scores.append(np.ones_like(outputs[pair_per_branch * i + 1][:, :1, :, :], dtype=np.float32))
-
-    def sp_flatten(_in):
-        ch = _in.shape[1]
-        _in = _in.transpose(0, 2, 3, 1)
-        return _in.reshape(-1, ch)
-
-    boxes = [sp_flatten(_v) for _v in boxes]
-    classes_conf = [sp_flatten(_v) for _v in classes_conf]
-    scores = [sp_flatten(_v) for _v in scores]
+        box_out = outputs[pair_per_branch * i]
+        cls_out = outputs[pair_per_branch * i + 1]
+        n, num_classes, grid_h, grid_w = cls_out.shape
+
+        cls_flat = cls_out.reshape(n, num_classes, grid_h * grid_w)
+        class_max_score = cls_flat.max(axis=1)
+        if quant_params is None:
+            b_idx, pos = np.nonzero(class_max_score >= obj_thresh)
+        else:
+            # (q - zp) * scale >= thresh  <=>  q >= ceil(thresh / scale + zp)
+            cls_scale, cls_zp = quant_params[pair_per_branch * i + 1]
+            b_idx, pos = np.nonzero(class_max_score >= np.ceil(obj_thresh / cls_scale + cls_zp))
+        if pos.size == 0:
+            continue
+
+        branch_scores = class_max_score[b_idx, pos]
+        logits = box_out.reshape(n, box_out.shape[1], grid_h * grid_w)[b_idx, :, pos]
+        if quant_params is not None:
+            branch_scores = _dequant(branch_scores, cls_scale, cls_zp)
+            logits = _dequant(logits, *quant_params[pair_per_branch * i])
+
+        scores.append(branch_scores)
+        classes.append(cls_flat[b_idx, :, pos].argmax(axis=-1))
+        boxes.append(_decode_boxes(logits, pos, grid_h, grid_w, img_size))
+
+    if not boxes:
+        return None, None, None
 
     boxes = np.concatenate(boxes)
-    classes_conf = np.concatenate(classes_conf)
+    classes = np.concatenate(classes)
     scores = np.concatenate(scores)
 
-    # 过滤低置信度
-    boxes, classes, scores = _filter_boxes(boxes, scores, classes_conf, obj_thresh)
-
-    # 按类别分别进行 NMS
-    nboxes, nclasses, nscores = [], [], []
-    for c in set(classes):
-        inds = np.where(classes == c)
-        b = boxes[inds]
-        cls = classes[inds]
-        s = scores[inds]
-        keep = nms(b, s, nms_thresh)
-
-        if len(keep) != 0:
-            nboxes.append(b[keep])
-            nclasses.append(cls[keep])
-            nscores.append(s[keep])
-
-    if not nclasses and not nscores:
-        return None, None, None
+    # 按类别 NMS，一次调用完成
+    keep = _batched_nms(boxes, scores, classes, nms_thresh)
 
-    boxes = np.concatenate(nboxes)
-    classes = np.concatenate(nclasses)
-    scores = np.concatenate(nscores)
+    boxes = boxes[keep]
+    classes = classes[keep]
+    scores = scores[keep]
 
     return boxes, classes, scores
 
@@ -7,22 +7,33 @@ import cv2
 import numpy as np
 from typing import Optional, Tuple
 
-from .config import MODEL_INPUT_SIZE
+from .config import MODEL_INPUT_SIZE, RESIZE_DOWNSCALE_INTERP
+
+_INTERP = {"linear": cv2.INTER_LINEAR, "area": cv2.INTER_AREA}
+
+
+def _resize_interp(src_w: int, src_h: int, dst_w: int, dst_h: int) -> int:
+    """缩小时使用配置的插值方式，放大时使用 INTER_LINEAR"""
+    if dst_w <= src_w and dst_h <= src_h:
+        return _INTERP[RESIZE_DOWNSCALE_INTERP]
+    return cv2.INTER_LINEAR
 
 
 def preprocess(
     img: np.ndarray,
-    target_size: Optional[tuple[int, int]] = None
+    target_size: Optional[tuple[int, int]] = None,
+    swap_rb: bool = True
 ) -> np.ndarray:
     """
-    统一预处理：BGR→RGB + resize
+    统一预处理：resize + BGR→RGB（先缩小再转色，减少转色像素数）
     
     Args:
         img: OpenCV 读取的 BGR 图像 (H, W, 3)
         target_size: 目标尺寸 (width, height)，默认使用 config.MODEL_INPUT_SIZE
+        swap_rb: 是否做 BGR→RGB，模型以 BGR 顺序导出时传 False
     
     Returns:
-        处理后的 RGB 图像，uint8 格式
+        处理后的 RGB 图像（swap_rb=False 时为 BGR），uint8 格式
     
     注意：
         - ⚠️ 不做 normalize，RKNN 模型内部处理
@@ -31,8 +42,10 @@ def preprocess(
     if target_size is None:
         target_size = MODEL_INPUT_SIZE
     
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    img = cv2.resize(img, target_size)
+    h, w = img.shape[:2]
+    img = cv2.resize(img, target_size, interpolation=_resize_interp(w, h, *target_size))
+    if swap_rb:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
     img = img.astype(np.uint8)
     return img
 
@@ -40,7 +53,9 @@ def preprocess(
 def preprocess_with_letterbox(
     img: np.ndarray,
     target_size: Optional[tuple[int, int]] = None,
-    color: tuple[int, int, int] = (0, 0, 0)
+    color: tuple[int, int, int] = (0, 0, 0),
+    swap_rb: bool = True,
+    dst: Optional[np.ndarray] = None
 ) -> tuple[np.ndarray, float, tuple[int, int]]:
     """
     带 letterbox 的预处理（保持宽高比）
@@ -48,10 +63,13 @@ def preprocess_with_letterbox(
     Args:
         img: OpenCV 读取的 BGR 图像 (H, W, 3)
         target_size: 目标尺寸 (width, height)，默认使用 config.MODEL_INPUT_SIZE
-        color: 填充颜色，默认黑色 (0,0,0)
+        color: 填充颜色（BGR），默认黑色 (0,0,0)
+        swap_rb: 是否做 BGR→RGB，模型以 BGR 顺序导出时传 False
+        dst: 可复用的输出画布 (target_h, target_w, 3) uint8；传入时只写有效区域，
+             填充区域由调用方预先填好（输入尺寸不变时填充区域不会变化）
     
     Returns:
-        img_padded: 处理后的 RGB 图像
+        img_padded: 处理后的 RGB 图像（swap_rb=False 时为 BGR），传入 dst 时即为 dst
         scale: 缩放比例
         pad: 填充偏移 (pad_x, pad_y)
     """
@@ -63,13 +81,21 @@ def preprocess_with_letterbox(
     scale = min(target_w / w, target_h / h)
     new_w, new_h = int(w * scale), int(h * scale)
     
-    img_resized = cv2.resize(img, (new_w, new_h))
-    img_padded = np.full((target_h, target_w, 3), color, dtype=np.uint8)
-    
     pad_x = (target_w - new_w) // 2
     pad_y = (target_h - new_h) // 2
-    img_padded[pad_y:pad_y+new_h, pad_x:pad_x+new_w] = img_resized
-    img_padded = cv2.cvtColor(img_padded, cv2.COLOR_BGR2RGB)
+    
+    if dst is None:
+        # 填充色按输出通道顺序
+        img_padded = np.full((target_h, target_w, 3), color[::-1] if swap_rb else color, dtype=np.uint8)
+    else:
+        img_padded = dst
+    roi = img_padded[pad_y:pad_y+new_h, pad_x:pad_x+new_w]
+    interp = _resize_interp(w, h, new_w, new_h)
+    
+    # 直接缩放到画布的有效区域（无中间缓冲），再只对该区域原地做 BGR→RGB
+    cv2.resize(img, (new_w, new_h), dst=roi, interpolation=interp)
+    if swap_rb:
+        cv2.cvtColor(roi, cv2.COLOR_BGR2RGB, dst=roi)
     
     return img_padded, scale, (pad_x, pad_y)
 
@@ -93,8 +119,7 @@ def restore_coords(
     if boxes is None:
         return None
     
+    # 一次广播运算完成平移和缩放（结果为新数组，不修改输入）
     pad_x, pad_y = pad
-    boxes = boxes.copy()
-    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_x) / scale
-    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_y) / scale
-    return boxes
+    pad_arr = np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)
+    return (boxes - pad_arr) * (1.0 / scale)
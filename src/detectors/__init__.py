@@ -2,3 +2,4 @@
 from .base_model import BaseRKNNModel
 from .detector import create_model_detector, BaseModelDetector, ONNXModelDetector, RKNNModelDetector
 from .yolo_detector import YOLOv8ModelDetector
+from .pool import DetectorPool
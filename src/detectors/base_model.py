@@ -8,6 +8,8 @@ from typing import Any, Iterable, Protocol
 
 import numpy as np
 
+from ..common.config import RKNN_INPUT_PASS_THROUGH
+
 
 class _RKNNRuntime(Protocol):
     """用于类型约束的最小 RKNN 运行时协议"""
@@ -16,11 +18,32 @@ class _RKNNRuntime(Protocol):
 
     def init_runtime(self, core_mask: int | None = None) -> int: ...
 
-    def inference(self, inputs: Iterable[np.ndarray]) -> list[np.ndarray]: ...
+    def inference(
+        self,
+        inputs: Iterable[np.ndarray],
+        data_format: str | None = None,
+        inputs_pass_through: list[int] | None = None,
+    ) -> list[np.ndarray]: ...
 
     def release(self) -> None: ...
 
 
+def rknn_inference(rknn: _RKNNRuntime, img_input: np.ndarray, pass_through: bool = False) -> list[np.ndarray]:
+    """
+    送入单张 uint8 HWC 图像执行推理
+
+    显式声明 NHWC 排布；输入需为 C 连续（letterbox 画布本身连续，不会触发拷贝）。
+    pass_through=True 时运行时跳过归一化/量化，要求模型输入本身就是 uint8 NHWC。
+    """
+    if not img_input.flags["C_CONTIGUOUS"]:
+        img_input = np.ascontiguousarray(img_input)
+    return rknn.inference(
+        inputs=[img_input[np.newaxis]],
+        data_format="nhwc",
+        inputs_pass_through=[1] if pass_through else None,
+    )
+
+
 class BaseRKNNModel:
     """所有 RKNN 模型的基类"""
 
@@ -47,6 +70,7 @@ class BaseRKNNModel:
             raise RuntimeError("初始化运行时失败")
 
         self.model_path = model_path
+        self.pass_through = RKNN_INPUT_PASS_THROUGH
 
     def preprocess(self, img: np.ndarray) -> np.ndarray:
         """子类实现：BGR 图像 -> 模型输入格式"""
@@ -59,7 +83,7 @@ class BaseRKNNModel:
     def infer(self, img: np.ndarray) -> Any:
         """执行预处理-推理-后处理的完整链路。"""
         img_input = self.preprocess(img)
-        outputs = self.rknn.inference(inputs=[img_input])
+        outputs = rknn_inference(self.rknn, img_input, self.pass_through)
         return self.postprocess(outputs)
 
     def release(self) -> None:
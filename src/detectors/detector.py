@@ -13,8 +13,11 @@ from typing import Optional, Sequence
 
 from ..common.preprocess import preprocess_with_letterbox, restore_coords
 from ..common.postprocess import yolov8_postprocess, get_class_name
-from ..common.config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH
+from ..common.draw import get_result_drawer
+from ..common.config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH, RKNN_INPUT_BGR, ONNX_PROVIDERS
+from ..common.config import RKNN_INPUT_PASS_THROUGH
 from ..common.logger import zlog
+from .base_model import rknn_inference
 
 
 class BaseModelDetector(ABC):
@@ -26,6 +29,15 @@ class BaseModelDetector(ABC):
         self.input_size = MODEL_INPUT_SIZE
         self._scale = 1.0
         self._pad = (0, 0)
+        # 模型输入是否为 BGR 顺序
+        self.input_bgr = False
+        # 预处理阶段是否做 BGR→RGB（子类可把通道倒序挪到后续步骤中完成）
+        self._swap_rb_in_preprocess = True
+        # letterbox 画布复用：输入尺寸不变时填充区域不变，只需覆盖有效区域
+        self._pad_buf = None
+        self._last_hw = None
+        # 结果绘制（颜色表、标签贴图进程内共享，只生成一次）
+        self._drawer = get_result_drawer()
     
     @abstractmethod
     def _inference(self, img_input: np.ndarray) -> Sequence[np.ndarray]:
@@ -55,8 +67,14 @@ class BaseModelDetector(ABC):
             scores: 置信度
             names: 类别名称
         """
-        # 预处理
-        img_input, self._scale, self._pad = preprocess_with_letterbox(img, self.input_size)
+        # 预处理（输入尺寸变化时重建黑色画布）
+        if img.shape[:2] != self._last_hw:
+            w, h = self.input_size
+            self._pad_buf = np.zeros((h, w, 3), dtype=np.uint8)
+            self._last_hw = img.shape[:2]
+        img_input, self._scale, self._pad = preprocess_with_letterbox(
+            img, self.input_size, swap_rb=self._swap_rb_in_preprocess, dst=self._pad_buf
+        )
         
         # 推理
         outputs = self._inference(img_input)
@@ -74,6 +92,10 @@ class BaseModelDetector(ABC):
         
         return None, None, None, None
     
+    def draw_results(self, img, boxes, classes, scores, names=None):
+        """在图像上绘制检测结果（直接在 img 上绘制，需要保留原图时由调用方先 copy）"""
+        return self._drawer.draw(img, boxes, classes, scores, names)
+    
     def __enter__(self):
         return self
     
@@ -88,28 +110,48 @@ class ONNXModelDetector(BaseModelDetector):
         super().__init__(obj_thresh, nms_thresh)
         
         import onnxruntime as ort
-        self.session = ort.InferenceSession(model_path)
+        available = ort.get_available_providers()
+        providers = [p for p in ONNX_PROVIDERS if p in available] or available
+        self.session = ort.InferenceSession(model_path, providers=providers)
         self.input_name = self.session.get_inputs()[0].name
+        self.output_names = [o.name for o in self.session.get_outputs()]
         self.model_path = model_path
-        zlog.info(f"[ONNX] 加载模型: {model_path}")
+        
+        # 模型输入为 RGB：letterbox 保持 BGR，通道倒序在 _inference 转 NCHW 时一并完成，省去一次整图 cvtColor
+        self._swap_rb_in_preprocess = False
+        
+        # 预分配 NCHW float32 输入缓冲区，每帧复用
+        w, h = self.input_size
+        self._blob = np.empty((1, 3, h, w), dtype=np.float32)
+        
+        # IOBinding：输入直接绑定到 _blob 的内存，避免每帧重新封装/拷贝输入
+        self._io = self.session.io_binding()
+        self._ort_in = ort.OrtValue.ortvalue_from_numpy(self._blob)
+        self._io.bind_ortvalue_input(self.input_name, self._ort_in)
+        for name in self.output_names:
+            self._io.bind_output(name, 'cpu')
+        zlog.info(f"[ONNX] 加载模型: {model_path}（{self.session.get_providers()[0]}）")
     
     def _inference(self, img_input):
         """ONNX 推理"""
-        # ONNX 需要 NCHW + float32 + 归一化
-        img = img_input.transpose((2, 0, 1))
-        img = img.reshape(1, *img.shape).astype(np.float32) / 255.0
-        outputs = self.session.run(None, {self.input_name: img})
-        return outputs
+        # ONNX 需要 NCHW + RGB + float32 + 归一化：转置、通道倒序、类型转换、缩放一次写入缓冲区
+        # 用除法而不是乘 1/255：与 astype(float32) / 255.0 逐位一致
+        np.divide(img_input.transpose((2, 0, 1))[::-1], np.float32(255.0),
+                  out=self._blob[0], casting='unsafe')
+        self.session.run_with_iobinding(self._io)
+        return self._io.copy_outputs_to_cpu()
     
     def release(self):
         """释放资源"""
+        self._io = None
+        self._ort_in = None
         self.session = None
 
 
 class RKNNModelDetector(BaseModelDetector):
     """RKNN 模型检测器（板端部署用）"""
     
-    def __init__(self, model_path, obj_thresh=None, nms_thresh=None, core_mask=None):
+    def __init__(self, model_path, obj_thresh=None, nms_thresh=None, core_mask=None, input_bgr=None):
         super().__init__(obj_thresh, nms_thresh)
         
         # 自动识别 PC 还是板端
@@ -137,12 +179,14 @@ class RKNNModelDetector(BaseModelDetector):
             raise RuntimeError("初始化运行时失败")
         
         self.model_path = model_path
+        self.input_bgr = input_bgr if input_bgr is not None else RKNN_INPUT_BGR
+        self._swap_rb_in_preprocess = not self.input_bgr
+        self.pass_through = RKNN_INPUT_PASS_THROUGH
     
     def _inference(self, img_input):
         """RKNN 推理"""
-        # RKNN 直接用 uint8 HWC 格式
-        outputs = self.rknn.inference(inputs=[img_input])
-        return outputs
+        # RKNN 直接用 uint8 NHWC 格式（letterbox 画布，无需转置/拷贝）
+        return rknn_inference(self.rknn, img_input, self.pass_through)
     
     def release(self):
         """释放资源"""
@@ -155,7 +199,8 @@ def create_model_detector(
     model_path: str, 
     obj_thresh: Optional[float] = None, 
     nms_thresh: Optional[float] = None, 
-    core_mask: Optional[int] = None
+    core_mask: Optional[int] = None,
+    input_bgr: Optional[bool] = None
 ) -> BaseModelDetector:
     """
     工厂函数：根据模型后缀自动创建对应的检测器
@@ -165,6 +210,9 @@ def create_model_detector(
         obj_thresh: 置信度阈值
         nms_thresh: NMS 阈值
         core_mask: NPU 核心掩码（仅 RKNN 板端有效）
+        input_bgr: RKNN 模型是否接受 BGR 输入，None 使用 config.RKNN_INPUT_BGR（仅 RKNN 有效）
+            True 时预处理跳过 BGR→RGB，摄像头帧直接送入 NPU；
+            ⚠️ 要求 .rknn 按 BGR 输入导出（通道顺序已折叠进模型），否则精度下降
     
     Returns:
         detector: ONNXModelDetector 或 RKNNModelDetector 实例
@@ -174,6 +222,6 @@ def create_model_detector(
     if ext == '.onnx':
         return ONNXModelDetector(model_path, obj_thresh, nms_thresh)
     elif ext == '.rknn':
-        return RKNNModelDetector(model_path, obj_thresh, nms_thresh, core_mask)
+        return RKNNModelDetector(model_path, obj_thresh, nms_thresh, core_mask, input_bgr)
     else:
         raise ValueError(f"不支持的模型格式: {ext}，支持 .onnx 和 .rknn")
@@ -1,18 +1,18 @@
 """
 YOLOv8 检测器 - 继承 BaseRKNNModel
 """
-import cv2
 import numpy as np
 from .base_model import BaseRKNNModel
 from ..common.preprocess import preprocess_with_letterbox, restore_coords
 from ..common.postprocess import yolov8_postprocess, get_class_name
-from ..common.config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH
+from ..common.draw import get_result_drawer
+from ..common.config import MODEL_INPUT_SIZE, OBJ_THRESH, NMS_THRESH, RKNN_INPUT_BGR
 
 
 class YOLOv8ModelDetector(BaseRKNNModel):
     """YOLOv8 目标检测器"""
     
-    def __init__(self, model_path, core_mask=None, obj_thresh=None, nms_thresh=None):
+    def __init__(self, model_path, core_mask=None, obj_thresh=None, nms_thresh=None, input_bgr=None):
         """
         初始化 YOLOv8 检测器
         
@@ -21,19 +21,35 @@ class YOLOv8ModelDetector(BaseRKNNModel):
             core_mask: NPU 核心掩码（仅板端有效）
             obj_thresh: 置信度阈值
             nms_thresh: NMS 阈值
+            input_bgr: 模型是否接受 BGR 输入，None 使用 config.RKNN_INPUT_BGR
         """
         super().__init__(model_path, core_mask)
         self.obj_thresh = obj_thresh if obj_thresh is not None else OBJ_THRESH
         self.nms_thresh = nms_thresh if nms_thresh is not None else NMS_THRESH
         self.input_size = MODEL_INPUT_SIZE
+        self.input_bgr = input_bgr if input_bgr is not None else RKNN_INPUT_BGR
         
         # 缓存 letterbox 参数，用于坐标还原
         self._scale = 1.0
         self._pad = (0, 0)
+        
+        # letterbox 画布复用：输入尺寸不变时填充区域不变，只需覆盖有效区域
+        w, h = self.input_size
+        self._input_buf = np.zeros((h, w, 3), dtype=np.uint8)
+        self._last_hw = None
+        
+        # 结果绘制（颜色表、标签贴图进程内共享，只生成一次）
+        self._drawer = get_result_drawer()
     
     def preprocess(self, img):
-        """预处理：letterbox + BGR→RGB"""
-        img_input, self._scale, self._pad = preprocess_with_letterbox(img, self.input_size)
+        """预处理：letterbox + BGR→RGB（BGR 模型跳过转换；返回复用的输入画布，不拷贝）"""
+        if img.shape[:2] != self._last_hw:
+            # 输入尺寸变化时重置填充区域
+            self._input_buf.fill(0)
+            self._last_hw = img.shape[:2]
+        img_input, self._scale, self._pad = preprocess_with_letterbox(
+            img, self.input_size, swap_rb=not self.input_bgr, dst=self._input_buf
+        )
         return img_input
     
     def postprocess(self, outputs):
@@ -70,34 +86,5 @@ class YOLOv8ModelDetector(BaseRKNNModel):
         return boxes, classes, scores, names
     
     def draw_results(self, img, boxes, classes, scores, names=None):
-        """在图像上绘制检测结果"""
-        if boxes is None:
-            return img
-        
-        img_draw = img.copy()
-        
-        for i, (box, cls, score) in enumerate(zip(boxes, classes, scores)):
-            x1, y1, x2, y2 = map(int, box)
-            name = names[i] if names else get_class_name(int(cls))
-            
-            # 不同类别用不同颜色
-            color = self._get_color(int(cls))
-            
-            # 画框
-            cv2.rectangle(img_draw, (x1, y1), (x2, y2), color, 2)
-            
-            # 画标签背景
-            label = f"{name}: {score:.2f}"
-            (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)
-            cv2.rectangle(img_draw, (x1, y1 - 20), (x1 + w, y1), color, -1)
-            
-            # 画标签文字
-            cv2.putText(img_draw, label, (x1, y1 - 5),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        return img_draw
-    
-    def _get_color(self, class_id):
-        """根据类别 ID 生成颜色"""
-        np.random.seed(class_id)
-        return tuple(np.random.randint(0, 255, 3).tolist())
+        """在图像上绘制检测结果（直接在 img 上绘制，需要保留原图时由调用方先 copy）"""
+        return self._drawer.draw(img, boxes, classes, scores, names)
@@ -1,6 +1,7 @@
 """
 跌倒判断器（业务逻辑层）
 """
+import math
 import numpy as np
 import time
 
@@ -15,7 +16,10 @@ class FallJudge:
         self.threshold_frames = threshold_frames
         self.angle_threshold = angle_threshold
         self.confirm_ratio = confirm_ratio
-        self.history = []
+        # 固定长度环形缓冲区：_hi 为写入位置，_hn 为有效帧数
+        self.history = np.zeros(threshold_frames, dtype=np.bool_)
+        self._hi = 0
+        self._hn = 0
         self.last_fall_time = None
     
     def judge(self, keypoints):
@@ -24,13 +28,14 @@ class FallJudge:
         
         angle = self._calc_body_angle(keypoints)
         is_falling = angle > self.angle_threshold
-        self.history.append(is_falling)
         
-        if len(self.history) > self.threshold_frames:
-            self.history.pop(0)
+        n = self.threshold_frames
+        self.history[self._hi] = is_falling
+        self._hi = (self._hi + 1) % n
+        self._hn = min(self._hn + 1, n)
         
-        if len(self.history) >= self.threshold_frames:
-            fall_ratio = sum(self.history) / len(self.history)
+        if self._hn >= n:
+            fall_ratio = np.count_nonzero(self.history) / n
             is_fall = fall_ratio >= self.confirm_ratio
             if is_fall:
                 self.last_fall_time = time.time()
@@ -40,17 +45,21 @@ class FallJudge:
     
     def _calc_body_angle(self, keypoints):
         try:
-            head = keypoints[0][:2]
-            hip = [(keypoints[11][0] + keypoints[12][0]) / 2,
-                   (keypoints[11][1] + keypoints[12][1]) / 2]
-            dx = head[0] - hip[0]
-            dy = head[1] - hip[1]
-            angle = np.abs(np.arctan2(dx, -dy) * 180 / np.pi)
-            return angle
-        except (IndexError, KeyError, TypeError, ValueError) as e:
+            kp = np.asarray(keypoints, dtype=np.float32)
+        except (TypeError, ValueError):
+            return 0
+        if kp.ndim != 2 or kp.shape[0] < 13 or kp.shape[1] < 2:
             # 关键点数据不完整或格式错误，返回 0 角度
             return 0
+        
+        hip = 0.5 * (kp[11, :2] + kp[12, :2])
+        dx, dy = (kp[0, :2] - hip).tolist()
+        # 只有两个标量，用 math 避免 numpy ufunc 的调度开销
+        angle = abs(math.degrees(math.atan2(dx, -dy)))
+        return angle
     
     def reset(self):
-        self.history.clear()
+        self.history[:] = False
+        self._hi = 0
+        self._hn = 0
         self.last_fall_time = None
@@ -11,17 +11,39 @@ RK3576 AI 视觉项目 - 主程序入口
     # 板端运行
     python3 main.py --camera 0 --model ../models/yolov8.rknn
 """
+import os
+import importlib.util
+
+
+def _set_omp_threads():
+    """
+    OpenMP 线程数需在导入 cv2 之前设置，取值与 config.OPENCV_NUM_THREADS 一致
+    
+    直接按文件加载 config.py（无第三方依赖），不经过 common/__init__，避免提前导入 cv2
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "common", "config.py")
+    spec = importlib.util.spec_from_file_location("_early_config", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    os.environ.setdefault("OMP_NUM_THREADS", str(config.OPENCV_NUM_THREADS))
+
+
+_set_omp_threads()
+
 import cv2
 import argparse
 import sys
-import os
+import queue
 import signal
+import threading
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from detectors import create_model_detector
+from detectors import create_model_detector, DetectorPool
 from common.camera import Camera, FPSCounter
-from common.config import OBJ_THRESH, NMS_THRESH, CAMERA_WIDTH, CAMERA_HEIGHT
+from common.config import OBJ_THRESH, NMS_THRESH, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_BACKEND, CPU_AFFINITY
+from common.config import NPU_CORE_MASKS
+from common.frame_gate import FrameDiffGate
 from common.logger import zlog
 
 # 版本号
@@ -75,6 +97,20 @@ def _graceful_exit(code: int = 0):
         sys.exit(code)
 
 
+def _set_cpu_affinity(cpus):
+    """将进程绑定到指定 CPU（之后创建的线程继承该设置），不支持或核心不存在时跳过"""
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return
+    
+    target = set(cpus) & os.sched_getaffinity(0)
+    if not target:
+        zlog.warn(f"CPU 亲和性设置无效，可用核心中不包含: {sorted(cpus)}")
+        return
+    
+    os.sched_setaffinity(0, target)
+    zlog.info(f"CPU 亲和性: {sorted(target)}")
+
+
 def _validate_args(args):
     """验证启动参数"""
     # 检查模型文件
@@ -97,24 +133,6 @@ def _validate_args(args):
     return True
 
 
-def draw_results(img, boxes, classes, scores, names):
-    """绘制检测结果"""
-    if boxes is None:
-        return img
-    
-    img_draw = img.copy()
-    for box, cls, score, name in zip(boxes, classes, scores, names):
-        x1, y1, x2, y2 = map(int, box)
-        color = (0, 255, 0) if name == "person" else (255, 0, 0)
-        
-        cv2.rectangle(img_draw, (x1, y1), (x2, y2), color, 2)
-        label = f"{name}: {score:.2f}"
-        cv2.putText(img_draw, label, (x1, y1 - 10),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-    
-    return img_draw
-
-
 def run_image(args):
     """图片检测（不负责 cleanup，由 _graceful_exit 统一处理）"""
     global _global_detector
@@ -141,7 +159,7 @@ def run_image(args):
         zlog.info("未检测到目标")
     
     # 绘制并保存
-    result = draw_results(img, boxes, classes, scores, names)
+    result = _global_detector.draw_results(img, boxes, classes, scores, names)
     output = args.output if args.output else "result.jpg"
     cv2.imwrite(output, result)
     zlog.info(f"结果保存: {output}")
@@ -152,41 +170,96 @@ def run_image(args):
         cv2.waitKey(0)
 
 
-def run_camera(args):
-    """摄像头检测（不负责 cleanup，由 _graceful_exit 统一处理）"""
-    global _global_detector, _global_camera, _running
-    
-    zlog.info(f"[摄像头模式] 设备 {args.camera}")
-    
-    # 创建检测器和摄像头
-    _global_detector = create_model_detector(args.model, args.conf, args.nms)
-    _global_camera = Camera(args.camera, args.width, args.height)
-    fps_counter = FPSCounter()
-    
-    zlog.info("按 'q' 或 Ctrl+C 退出")
-    
-    _global_camera.start()
+def _put_latest(q, item):
+    """放入队列；队列已满时丢弃最旧的一项（只保留最新结果）"""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+
+
+def _inference_worker(camera, detector, result_q, gate=None):
+    """推理线程：取帧 + 检测，结果交给主线程绘制显示"""
+    if gate is None:
+        gate = FrameDiffGate()
+    results = None
     
-    while _running:
-        frame = _global_camera.read()
+    # 帧要跨线程交给主线程，必须拷贝，避免被采集线程覆盖
+    # 低延迟模式下 frames() 会预取，推理当前帧的同时等待/解码下一帧；
+    # 连续采集模式下 frames() 等新帧存入后才产出，跳帧时不会反复处理同一帧
+    for frame in camera.frames(copy=True):
+        if not _running:
+            break
         if frame is None:
             continue
         
+        # 画面基本不变时跳过推理，复用上次结果（推理成功过才有参考帧）
+        if gate.should_skip(frame):
+            _put_latest(result_q, (frame, results))
+            continue
+        
         try:
             # 检测（单帧异常不中断）
-            boxes, classes, scores, names = _global_detector.detect(frame)
-            
-            # 绘制
-            frame = draw_results(frame, boxes, classes, scores, names)
+            results = detector.detect(frame)
+        except Exception as e:
+            zlog.warn(f"单帧推理异常，跳过: {e}")
+            results = None
+            gate.reset()
+            continue
+        
+        gate.mark_inferred()
+        _put_latest(result_q, (frame, results))
+
+
+def _pool_inference_worker(camera, pool, result_q):
+    """推理线程（多核）：保持 pool.size 帧在途，按提交顺序取回结果"""
+    def frames():
+        for frame in camera.frames(copy=True):
+            if not _running:
+                break
+            if frame is not None:
+                yield frame
+    
+    # 退出时 ordered() 会产出剩余的在途帧，保证释放检测器前推理已结束
+    for frame, future in pool.ordered(frames()):
+        try:
+            results = future.result()
         except Exception as e:
             zlog.warn(f"单帧推理异常，跳过: {e}")
             continue
         
-        # FPS
+        _put_latest(result_q, (frame, results))
+
+
+def _display_loop(detector, result_q, fps_counter):
+    """主线程：绘制 + 显示"""
+    global _running
+    
+    frame_idx = 0
+    last_count = -1
+    info_text = ""
+    
+    while _running:
+        try:
+            frame, (boxes, classes, scores, names) = result_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        
+        # 绘制
+        frame = detector.draw_results(frame, boxes, classes, scores, names)
+        
+        # FPS：每 10 帧（或目标数变化时）才重新计算并生成文字
         fps_counter.tick()
-        fps = fps_counter.get_fps()
         count = len(boxes) if boxes is not None else 0
-        cv2.putText(frame, f"FPS: {fps:.1f} | Objects: {count}", (10, 30),
+        if frame_idx % 10 == 0 or count != last_count:
+            info_text = f"FPS: {fps_counter.get_fps():.1f} | Objects: {count}"
+            last_count = count
+        frame_idx += 1
+        cv2.putText(frame, info_text, (10, 30),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         cv2.imshow('RK3576 AI Demo', frame)
@@ -194,6 +267,43 @@ def run_camera(args):
             _running = False  # 统一用状态控制退出
 
 
+def run_camera(args):
+    """摄像头检测（不负责 cleanup，由 _graceful_exit 统一处理）"""
+    global _global_detector, _global_camera, _running
+    
+    zlog.info(f"[摄像头模式] 设备 {args.camera}")
+    
+    # 创建检测器和摄像头（配置了多个 NPU 核时使用检测器池）
+    if NPU_CORE_MASKS and args.model.endswith('.rknn'):
+        _global_detector = DetectorPool(args.model, NPU_CORE_MASKS, args.conf, args.nms)
+        target = _pool_inference_worker
+    else:
+        _global_detector = create_model_detector(args.model, args.conf, args.nms)
+        target = _inference_worker
+    _global_camera = Camera(args.camera, args.width, args.height, backend=args.backend)
+    fps_counter = FPSCounter()
+    
+    zlog.info("按 'q' 或 Ctrl+C 退出")
+    
+    _global_camera.start()
+    
+    # 流水线：采集线程（Camera 内部）→ 推理线程 → 主线程绘制显示
+    # imshow/waitKey 必须留在主线程
+    result_q = queue.Queue(maxsize=1)
+    worker = threading.Thread(
+        target=target,
+        args=(_global_camera, _global_detector, result_q),
+        daemon=True
+    )
+    worker.start()
+    
+    try:
+        _display_loop(_global_detector, result_q, fps_counter)
+    finally:
+        _running = False
+        worker.join(timeout=2.0)
+
+
 def main():
     # 注册信号处理（只改状态，不直接退出）
     signal.signal(signal.SIGINT, _signal_handler)
@@ -207,6 +317,8 @@ def main():
     parser.add_argument('--nms', type=float, default=NMS_THRESH, help='NMS 阈值')
     parser.add_argument('--width', type=int, default=CAMERA_WIDTH)
     parser.add_argument('--height', type=int, default=CAMERA_HEIGHT)
+    parser.add_argument('--backend', type=str, default=CAMERA_BACKEND, choices=['gstreamer'],
+                        help='摄像头采集后端（默认 OpenCV 自动选择）')
     parser.add_argument('--output', type=str, help='输出路径')
     parser.add_argument('--show', action='store_true', help='显示窗口')
     parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
@@ -222,6 +334,9 @@ def main():
     if not _validate_args(args):
         return
     
+    # 绑定大核（在创建采集/推理线程之前）
+    _set_cpu_affinity(CPU_AFFINITY)
+    
     if args.image:
         run_image(args)
     elif args.camera is not None:
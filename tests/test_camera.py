@@ -0,0 +1,206 @@
+"""
+摄像头封装单元测试（使用模拟的 VideoCapture）
+"""
+import unittest
+import threading
+import time
+import numpy as np
+import sys
+import os
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+from common.camera import Camera
+from common.frame_gate import FrameDiffGate
+
+
+class FakeCapture:
+    """模拟 VideoCapture：每次 grab() 产生一帧，像素值为帧序号（static=True 时恒为 0）"""
+
+    def __init__(self, buffersize_ok=True, interval=0.002, static=False):
+        self.buffersize_ok = buffersize_ok
+        self.interval = interval
+        self.static = static
+        self.count = 0
+        self.frozen = threading.Event()
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            return self.buffersize_ok
+        return True
+
+    def grab(self):
+        time.sleep(self.interval)
+        if self.frozen.is_set():
+            return False
+        self.count += 1
+        return True
+
+    def retrieve(self, image=None):
+        frame = np.full((4, 4, 3), 0 if self.static else self.count % 256, dtype=np.uint8)
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def release(self):
+        pass
+
+
+def _start_camera(cap):
+    """用模拟设备启动摄像头（重连时也返回同一个模拟设备）"""
+    camera = Camera()
+    camera._create_capture = lambda: cap
+    return camera.start()
+
+
+class TestCamera(unittest.TestCase):
+    """摄像头采集测试"""
+
+    def test_low_latency_follows_buffersize(self):
+        """测试 CAP_PROP_BUFFERSIZE 设置成功才启用低延迟模式"""
+        for ok in (True, False):
+            camera = _start_camera(FakeCapture(buffersize_ok=ok))
+            try:
+                self.assertEqual(camera._low_latency, ok)
+            finally:
+                camera.release()
+
+    def test_read_returns_new_frame(self):
+        """测试每次 read() 都拿到新的一帧"""
+        for ok in (True, False):
+            camera = _start_camera(FakeCapture(buffersize_ok=ok))
+            try:
+                values = []
+                for _ in range(5):
+                    values.append(int(camera.read()[0, 0, 0]))
+                    time.sleep(0.01)
+                self.assertTrue(all(b > a for a, b in zip(values, values[1:])), values)
+            finally:
+                camera.release()
+
+    def test_zero_copy_only_in_low_latency(self):
+        """测试 copy=False 只在低延迟模式下返回内部缓冲区"""
+        camera = _start_camera(FakeCapture(buffersize_ok=True))
+        try:
+            frame = camera.read()
+            self.assertIs(frame, camera._bufs[camera._read_idx])
+            self.assertIsNot(camera.read(copy=True), camera._bufs[camera._read_idx])
+        finally:
+            camera.release()
+
+        camera = _start_camera(FakeCapture(buffersize_ok=False))
+        try:
+            frame = camera.read()
+            self.assertFalse(any(frame is buf for buf in camera._bufs))
+        finally:
+            camera.release()
+
+    def test_read_timeout_returns_previous_frame(self):
+        """测试低延迟模式下等待超时返回上一帧"""
+        cap = FakeCapture(buffersize_ok=True)
+        camera = _start_camera(cap)
+        try:
+            last = int(camera.read()[0, 0, 0])
+            cap.frozen.set()
+            start = time.time()
+            frame = camera.read(timeout=0.05)
+            self.assertGreaterEqual(time.time() - start, 0.05)
+            self.assertEqual(int(frame[0, 0, 0]), last)
+        finally:
+            camera.release()
+
+
+class TestCameraPrefetch(unittest.TestCase):
+    """预取测试"""
+
+    def test_continuous_mode_reads_synchronously(self):
+        """测试连续采集模式下 read_next_async 返回已完成的 Future，frames() 不预取"""
+        cap = FakeCapture(buffersize_ok=False)
+        camera = _start_camera(cap)
+        try:
+            self.assertTrue(camera.read_next_async().done())
+
+            # 模拟耗时推理后，拿到的应是当前最新帧而不是推理开始前的帧
+            frames = camera.frames()
+            next(frames)
+            time.sleep(0.03)
+            value = int(next(frames)[0, 0, 0])
+            self.assertLessEqual(cap.count - value, 2)
+            self.assertIsNone(camera._prefetch)
+        finally:
+            camera.release()
+
+    def test_continuous_mode_no_repeated_frames(self):
+        """测试连续采集模式下静止画面也不会重复产出/重复判断同一帧"""
+        cap = FakeCapture(buffersize_ok=False, interval=0.01, static=True)
+        camera = _start_camera(cap)
+        try:
+            gate = FrameDiffGate(diff_thresh=2.0, max_skip=3)
+            start_count = cap.count
+            yielded = inferred = 0
+            deadline = time.time() + 0.2
+            for frame in camera.frames():
+                if time.time() > deadline:
+                    break
+                yielded += 1
+                if not gate.should_skip(frame):
+                    gate.mark_inferred()
+                    inferred += 1
+            produced = cap.count - start_count
+            # 每帧最多产出一次（忙等时会产出成千上万次）
+            self.assertLessEqual(yielded, produced + 1)
+            # max_skip 按新帧计数：每 4 帧强制推理一次
+            self.assertLessEqual(inferred, yielded // 4 + 1)
+        finally:
+            camera.release()
+
+    def test_continuous_mode_timeout_yields_none(self):
+        """测试连续采集模式下超时没有新帧时产出 None"""
+        cap = FakeCapture(buffersize_ok=False)
+        camera = _start_camera(cap)
+        try:
+            frames = camera.frames(timeout=0.05)
+            self.assertIsNotNone(next(frames))
+            cap.frozen.set()
+            time.sleep(0.01)
+            next(frames)  # 冻结前可能还存入了一帧
+            start = time.time()
+            self.assertIsNone(next(frames))
+            self.assertGreaterEqual(time.time() - start, 0.05)
+        finally:
+            camera.release()
+
+    def test_low_latency_mode_prefetches(self):
+        """测试低延迟模式下 frames() 预取下一帧，帧号递增"""
+        cap = FakeCapture(buffersize_ok=True)
+        camera = _start_camera(cap)
+        try:
+            values = []
+            for frame in camera.frames():
+                values.append(int(frame[0, 0, 0]))
+                time.sleep(0.01)
+                if len(values) == 5:
+                    break
+            self.assertIsNotNone(camera._prefetch)
+            self.assertTrue(all(b > a for a, b in zip(values, values[1:])), values)
+
+            future = camera.read_next_async()
+            self.assertGreater(int(future.result()[0, 0, 0]), values[-1])
+        finally:
+            camera.release()
+        self.assertIsNone(camera._prefetch)
+
+
+if __name__ == '__main__':
+    unittest.main()
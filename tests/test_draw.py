@@ -0,0 +1,121 @@
+"""
+检测结果绘制单元测试
+"""
+import unittest
+from unittest import mock
+import numpy as np
+import sys
+import os
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+from common.draw import ResultDrawer, _blit, _stamp
+
+
+class TestBlit(unittest.TestCase):
+    """贴图裁剪测试"""
+
+    def setUp(self):
+        self.patch = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3) + 1
+
+    def test_inside(self):
+        """测试完全在图像内"""
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        _blit(img, self.patch, 2, 3)
+        np.testing.assert_array_equal(img[3:7, 2:8], self.patch)
+        self.assertEqual(np.count_nonzero(img.any(axis=2)), 24)
+
+    def test_negative_xy(self):
+        """测试左上角越界时裁掉超出部分"""
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        _blit(img, self.patch, -2, -1)
+        np.testing.assert_array_equal(img[0:3, 0:4], self.patch[1:, 2:])
+        self.assertEqual(np.count_nonzero(img.any(axis=2)), 12)
+
+    def test_right_bottom_edge(self):
+        """测试右下角越界时裁掉超出部分"""
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        _blit(img, self.patch, 7, 8)
+        np.testing.assert_array_equal(img[8:10, 7:10], self.patch[:2, :3])
+        self.assertEqual(np.count_nonzero(img.any(axis=2)), 6)
+
+    def test_fully_outside(self):
+        """测试完全在图像外时不修改图像"""
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        _blit(img, self.patch, 10, 0)
+        _blit(img, self.patch, -6, 0)
+        _blit(img, self.patch, 0, -4)
+        self.assertFalse(img.any())
+
+
+class TestStamp(unittest.TestCase):
+    """掩码贴图裁剪测试"""
+
+    def setUp(self):
+        self.mask = np.zeros((4, 6, 3), dtype=np.bool_)
+        self.mask[::2, ::2] = True
+
+    def test_negative_xy(self):
+        """测试左上角越界时只写入图像内的掩码像素"""
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        _stamp(img, self.mask, -1, -1)
+        expected = np.zeros((10, 10, 3), dtype=np.uint8)
+        expected[0:3, 0:5][self.mask[1:, 1:]] = 255
+        np.testing.assert_array_equal(img, expected)
+
+    def test_right_bottom_edge(self):
+        """测试右下角越界时只写入图像内的掩码像素"""
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        _stamp(img, self.mask, 8, 7, value=9)
+        expected = np.zeros((10, 10, 3), dtype=np.uint8)
+        expected[7:10, 8:10][self.mask[:3, :2]] = 9
+        np.testing.assert_array_equal(img, expected)
+
+
+class TestResultDrawer(unittest.TestCase):
+    """绘制器测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.drawer = ResultDrawer()
+
+    def _draw(self, classes, scores, names=None):
+        img = np.zeros((120, 240, 3), dtype=np.uint8)
+        boxes = np.array([[20.0, 60.0, 200.0, 110.0]] * len(classes))
+        return img, self.drawer.draw(img, boxes, np.array(classes), np.array(scores), names)
+
+    def test_draw_in_place(self):
+        """测试在传入的图像上原地绘制并返回同一对象"""
+        img, out = self._draw([0], [0.9])
+        self.assertIs(out, img)
+        self.assertTrue(img.any())
+
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        self.assertIs(self.drawer.draw(img, None, None, None), img)
+
+    def test_label_color_matches_box(self):
+        """测试名称与类别不对应时，标签背景仍使用框的颜色"""
+        # 'person' 的预渲染贴图是类别 0 的颜色
+        img, _ = self._draw([5], [0.5], names=['person'])
+        color = self.drawer._get_color(5)
+        # 框左上角与标签背景左上角像素
+        np.testing.assert_array_equal(img[60, 20], color)
+        np.testing.assert_array_equal(img[40, 20], color)
+
+    def test_score_out_of_range_fallback(self):
+        """测试超出 0.00~1.00 的分数回退到 putText 绘制"""
+        with mock.patch.object(cv2, 'putText', wraps=cv2.putText) as put_text:
+            self._draw([0], [0.5])
+            put_text.assert_not_called()
+
+            img, _ = self._draw([0], [1.5])
+            put_text.assert_called_once()
+            self.assertEqual(put_text.call_args[0][1], "1.50")
+        # 分数区域有白色文字
+        self.assertTrue((img[40:61] == 255).all(axis=2).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
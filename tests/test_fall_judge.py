@@ -0,0 +1,90 @@
+"""
+跌倒判断器单元测试
+"""
+import unittest
+import numpy as np
+import sys
+import os
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from logic.fall_judge import FallJudge
+
+
+def _make_keypoints(fallen):
+    """构造 17 个关键点：站立时鼻子在髋部正上方，跌倒时在髋部水平方向"""
+    kp = np.zeros((17, 3), dtype=np.float32)
+    kp[11, :2] = (100, 200)
+    kp[12, :2] = (120, 200)
+    kp[0, :2] = (210, 200) if fallen else (110, 100)
+    return kp
+
+
+class TestFallJudge(unittest.TestCase):
+    """跌倒判断测试"""
+
+    def test_no_verdict_before_threshold_frames(self):
+        """测试历史帧数不足时不判定跌倒"""
+        judge = FallJudge(threshold_frames=5)
+        for _ in range(4):
+            is_fall, angle = judge.judge(_make_keypoints(True))
+            self.assertFalse(is_fall)
+            self.assertAlmostEqual(angle, 90.0, places=3)
+
+        is_fall, _ = judge.judge(_make_keypoints(True))
+        self.assertTrue(is_fall)
+
+    def test_confirm_ratio_after_wrap(self):
+        """测试环形缓冲区写满回绕后，比例只统计最近 threshold_frames 帧"""
+        judge = FallJudge(threshold_frames=5, confirm_ratio=0.8)
+        for _ in range(5):
+            judge.judge(_make_keypoints(False))
+
+        # 最近 5 帧：F F T T T，比例 0.6
+        for _ in range(3):
+            is_fall, _ = judge.judge(_make_keypoints(True))
+        self.assertFalse(is_fall)
+
+        # 最近 5 帧：F T T T T，比例 0.8
+        is_fall, _ = judge.judge(_make_keypoints(True))
+        self.assertTrue(is_fall)
+
+        # 再写 2 帧站立：T T T F F，比例 0.6
+        judge.judge(_make_keypoints(False))
+        is_fall, _ = judge.judge(_make_keypoints(False))
+        self.assertFalse(is_fall)
+
+    def test_reset_clears_history(self):
+        """测试 reset() 清空计数，需要重新累积 threshold_frames 帧"""
+        judge = FallJudge(threshold_frames=3)
+        for _ in range(3):
+            judge.judge(_make_keypoints(True))
+        judge.reset()
+
+        self.assertIsNone(judge.last_fall_time)
+        for _ in range(2):
+            is_fall, _ = judge.judge(_make_keypoints(True))
+            self.assertFalse(is_fall)
+        is_fall, _ = judge.judge(_make_keypoints(True))
+        self.assertTrue(is_fall)
+
+    def test_malformed_keypoints_angle_zero(self):
+        """测试关键点格式错误时角度为 0"""
+        judge = FallJudge()
+        ragged = [[0, 0], [1, 2, 3]] + [[0, 0]] * 15
+        self.assertEqual(judge._calc_body_angle(ragged), 0)
+        self.assertEqual(judge._calc_body_angle(np.zeros((12, 3))), 0)
+        self.assertEqual(judge._calc_body_angle(None), 0)
+        self.assertEqual(judge._calc_body_angle(np.zeros((17, 1))), 0)
+
+    def test_short_keypoints_skipped(self):
+        """测试关键点为 None 或不足 12 个时直接返回，不计入历史"""
+        judge = FallJudge(threshold_frames=2)
+        self.assertEqual(judge.judge(None), (False, 0))
+        self.assertEqual(judge.judge(np.zeros((11, 3))), (False, 0))
+        self.assertEqual(judge._hn, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+静止画面跳帧单元测试
+"""
+import unittest
+import numpy as np
+import sys
+import os
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from common.frame_gate import FrameDiffGate, _frame_thumb
+
+
+def _frame(value, h=720, w=1280):
+    return np.full((h, w, 3), value, dtype=np.uint8)
+
+
+class TestFrameThumb(unittest.TestCase):
+    """缩略图测试"""
+
+    def test_thumb_shape_and_dtype(self):
+        """测试缩略图为 8x8 int16（作差不会溢出）"""
+        thumb = _frame_thumb(_frame(200))
+        self.assertEqual(thumb.shape, (8, 8))
+        self.assertEqual(thumb.dtype, np.int16)
+        self.assertTrue(np.all(thumb == 200))
+
+    def test_thumb_cell_average(self):
+        """测试每个缩略图像素是对应区域的平均灰度"""
+        frame = _frame(0)
+        frame[:90, :160] = 100  # 恰好一个格子
+        thumb = _frame_thumb(frame)
+        self.assertEqual(thumb[0, 0], 100)
+        self.assertEqual(np.count_nonzero(thumb), 1)
+
+
+class TestFrameDiffGate(unittest.TestCase):
+    """跳帧判断测试"""
+
+    def test_first_frame_always_inferred(self):
+        """测试没有参考帧时不跳过"""
+        gate = FrameDiffGate(diff_thresh=2.0, max_skip=10)
+        self.assertFalse(gate.should_skip(_frame(0)))
+
+    def test_static_frames_skipped(self):
+        """测试画面不变时跳过，变化超过阈值时推理"""
+        gate = FrameDiffGate(diff_thresh=2.0, max_skip=10)
+        gate.should_skip(_frame(0))
+        gate.mark_inferred()
+
+        self.assertTrue(gate.should_skip(_frame(1)))
+        self.assertFalse(gate.should_skip(_frame(3)))
+
+    def test_compared_with_last_inferred_frame(self):
+        """测试缓慢变化累积到阈值后重新推理"""
+        gate = FrameDiffGate(diff_thresh=2.0, max_skip=10)
+        gate.should_skip(_frame(0))
+        gate.mark_inferred()
+
+        self.assertTrue(gate.should_skip(_frame(1)))
+        self.assertFalse(gate.should_skip(_frame(2)))
+
+    def test_max_skip_forces_inference(self):
+        """测试小目标变化低于阈值时，连续跳过 max_skip 帧后强制推理"""
+        gate = FrameDiffGate(diff_thresh=2.0, max_skip=3)
+        gate.should_skip(_frame(0))
+        gate.mark_inferred()
+
+        # 一个格子变化 100，平均差 100 / 64 ≈ 1.56 < 2.0
+        frame = _frame(0)
+        frame[:90, :160] = 100
+        self.assertEqual([gate.should_skip(frame) for _ in range(4)], [True, True, True, False])
+
+        # 推理后以新帧为参考，计数重新开始
+        gate.mark_inferred()
+        self.assertTrue(gate.should_skip(frame))
+
+    def test_reset_and_disabled(self):
+        """测试 reset() 后必定推理；阈值 <= 0 时关闭跳帧"""
+        gate = FrameDiffGate(diff_thresh=2.0, max_skip=10)
+        gate.should_skip(_frame(0))
+        gate.mark_inferred()
+        gate.reset()
+        self.assertFalse(gate.should_skip(_frame(0)))
+
+        gate = FrameDiffGate(diff_thresh=0, max_skip=10)
+        gate.should_skip(_frame(0))
+        gate.mark_inferred()
+        self.assertFalse(gate.should_skip(_frame(0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+检测器池单元测试（使用模拟检测器）
+"""
+import unittest
+from unittest import mock
+import time
+import numpy as np
+import sys
+import os
+
+# detectors 使用包内相对导入，需从仓库根目录按 src 包导入
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.detectors import pool as pool_module
+from src.detectors.pool import DetectorPool
+
+
+class FakeDetector:
+    """模拟检测器：记录是否被并发调用，结果为输入帧的像素值"""
+
+    def __init__(self, core_mask, delay):
+        self.core_mask = core_mask
+        self.delay = delay
+        self.busy = False
+        self.overlapped = False
+        self.calls = 0
+        self.done = 0
+        self.released = False
+
+    def detect(self, img):
+        if self.busy:
+            self.overlapped = True
+        self.busy = True
+        self.calls += 1
+        # 延迟随帧变化，让完成顺序与提交顺序不同
+        time.sleep(self.delay * (1 + int(img[0, 0, 0]) % 3))
+        self.busy = False
+        self.done += 1
+        return int(img[0, 0, 0])
+
+    def draw_results(self, img, *args):
+        return img
+
+    def release(self):
+        self.released = True
+
+
+class TestDetectorPool(unittest.TestCase):
+    """检测器池测试"""
+
+    def _make_pool(self, core_masks=(1, 2), delay=0.005):
+        created = []
+
+        def fake_create(model_path, obj_thresh, nms_thresh, core_mask, input_bgr):
+            det = FakeDetector(core_mask, delay)
+            created.append(det)
+            return det
+
+        with mock.patch.object(pool_module, 'create_model_detector', side_effect=fake_create):
+            pool = DetectorPool('model.rknn', core_masks)
+        return pool, created
+
+    def _frames(self, n):
+        return [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(n)]
+
+    def test_instance_per_core_mask(self):
+        """测试每个核心掩码创建一个实例"""
+        pool, created = self._make_pool((1, 2, 4))
+        try:
+            self.assertEqual(pool.size, 3)
+            self.assertEqual([d.core_mask for d in created], [1, 2, 4])
+        finally:
+            pool.release()
+
+    def test_no_concurrent_use_of_instance(self):
+        """测试同一实例不会同时处理两帧"""
+        pool, created = self._make_pool()
+        try:
+            futures = [pool.submit(f) for f in self._frames(20)]
+            self.assertEqual([f.result() for f in futures], list(range(20)))
+        finally:
+            pool.release()
+        self.assertFalse(any(d.overlapped for d in created))
+        self.assertEqual(sum(d.calls for d in created), 20)
+        self.assertTrue(all(d.calls > 0 for d in created))
+
+    def test_ordered_results(self):
+        """测试 ordered() 按提交顺序产出结果，且产出时已完成"""
+        pool, _ = self._make_pool()
+        try:
+            results = []
+            for frame, future in pool.ordered(self._frames(12)):
+                self.assertTrue(future.done())
+                results.append((int(frame[0, 0, 0]), future.result()))
+        finally:
+            pool.release()
+        self.assertEqual(results, [(i, i) for i in range(12)])
+
+    def test_release_waits_for_in_flight(self):
+        """测试 release() 等在途推理结束后才释放实例"""
+        pool, created = self._make_pool(delay=0.05)
+        futures = [pool.submit(f) for f in self._frames(4)]
+        pool.release()
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(sum(d.done for d in created), 4)
+        self.assertTrue(all(d.released for d in created))
+
+    def test_shared_drawer(self):
+        """测试多个检测器实例共用同一个绘制器（贴图只生成一次）"""
+        from src.detectors.detector import BaseModelDetector
+
+        class Dummy(BaseModelDetector):
+            def _inference(self, img_input):
+                return []
+
+            def release(self):
+                pass
+
+        self.assertIs(Dummy()._drawer, Dummy()._drawer)
+
+
+if __name__ == '__main__':
+    unittest.main()
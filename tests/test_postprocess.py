@@ -2,6 +2,7 @@
 后处理模块单元测试
 """
 import unittest
+from unittest import mock
 import numpy as np
 import sys
 import os
@@ -9,7 +10,25 @@ import os
 # 添加 src 到路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from common.postprocess import nms, get_class_name
+from common import postprocess
+from common.postprocess import nms, get_class_name, yolov8_postprocess, _dfl, _dfl_top3
+
+
+def _make_outputs(cells, img_size=(640, 640), num_classes=80):
+    """
+    构造模拟的 YOLOv8 三分支输出
+
+    Args:
+        cells: [(branch, row, col, class_id, score), ...]
+    """
+    outputs = []
+    for stride in (8, 16, 32):
+        gh, gw = img_size[1] // stride, img_size[0] // stride
+        outputs.append(np.zeros((1, 64, gh, gw), dtype=np.float32))
+        outputs.append(np.zeros((1, num_classes, gh, gw), dtype=np.float32))
+    for branch, row, col, class_id, score in cells:
+        outputs[2 * branch + 1][0, class_id, row, col] = score
+    return outputs
 
 
 class TestNMS(unittest.TestCase):
@@ -62,6 +81,42 @@ class TestNMS(unittest.TestCase):
         self.assertEqual(keep[0], 0)
 
 
+class TestNMSBackends(unittest.TestCase):
+    """Numba / numpy 两种 NMS 实现一致性测试"""
+
+    def test_numpy_fallback_matches(self):
+        """测试纯 numpy 实现与默认实现结果一致"""
+        rng = np.random.default_rng(0)
+        xy = rng.uniform(0, 600, (300, 2))
+        wh = rng.uniform(5, 120, (300, 2))
+        boxes = np.hstack([xy, xy + wh]).astype(np.float32)
+        scores = rng.uniform(0, 1, 300).astype(np.float32)
+
+        keep = nms(boxes, scores, 0.45)
+        with mock.patch.object(postprocess, 'HAS_NUMBA', False):
+            keep_np = nms(boxes, scores, 0.45)
+
+        np.testing.assert_array_equal(keep, keep_np)
+
+    def test_postprocess_without_numba(self):
+        """测试无 Numba 时（OpenCV 批量 NMS）后处理结果一致"""
+        cells = [
+            (0, 10, 20, 0, 0.9),
+            (0, 10, 21, 0, 0.8),
+            (0, 10, 22, 2, 0.7),
+            (1, 5, 5, 1, 0.6),
+        ]
+        outputs = _make_outputs(cells)
+
+        boxes, classes, scores = yolov8_postprocess(outputs)
+        with mock.patch.object(postprocess, 'HAS_NUMBA', False):
+            boxes_cv, classes_cv, scores_cv = yolov8_postprocess(outputs)
+
+        order, order_cv = np.argsort(-scores), np.argsort(-scores_cv)
+        np.testing.assert_allclose(boxes[order], boxes_cv[order_cv])
+        np.testing.assert_array_equal(classes[order], classes_cv[order_cv])
+
+
 class TestGetClassName(unittest.TestCase):
     """类别名称获取测试"""
     
@@ -84,6 +139,77 @@ class TestGetClassName(unittest.TestCase):
         self.assertNotEqual(result_79, "")
 
 
+class TestYolov8Postprocess(unittest.TestCase):
+    """YOLOv8 后处理测试"""
+
+    def test_empty_output(self):
+        """测试无目标"""
+        boxes, classes, scores = yolov8_postprocess(_make_outputs([]))
+        self.assertIsNone(boxes)
+        self.assertIsNone(classes)
+        self.assertIsNone(scores)
+
+    def test_box_decode(self):
+        """测试 DFL 解码：均匀分布的期望为 7.5 个 stride"""
+        boxes, classes, scores = yolov8_postprocess(_make_outputs([(0, 10, 20, 0, 0.9)]))
+        self.assertEqual(len(boxes), 1)
+        self.assertEqual(classes[0], 0)
+        self.assertAlmostEqual(float(scores[0]), 0.9, places=5)
+        # 中心 (20.5, 10.5) * 8，半宽 7.5 * 8
+        np.testing.assert_allclose(boxes[0], [104, 24, 224, 144], atol=1e-3)
+
+    def test_nms_per_class(self):
+        """测试重叠的不同类别框不互相抑制"""
+        cells = [
+            (0, 10, 20, 0, 0.9),
+            (0, 10, 21, 0, 0.8),  # 与第一个框同类且高度重叠
+            (0, 10, 22, 2, 0.7),  # 与第一个框高度重叠但不同类
+        ]
+        boxes, classes, scores = yolov8_postprocess(_make_outputs(cells))
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual(sorted(classes.tolist()), [0, 2])
+        self.assertAlmostEqual(float(scores[classes == 0][0]), 0.9, places=5)
+
+    def test_quantized_outputs(self):
+        """测试 int8 输出：量化域阈值 + 只反量化候选框，结果与浮点输出一致"""
+        cells = [(0, 10, 20, 0, 0.9), (1, 5, 7, 3, 0.6), (2, 3, 3, 1, 0.24)]
+        outputs = _make_outputs(cells)
+        rng = np.random.default_rng(0)
+        for i in range(0, 6, 2):
+            outputs[i][:] = rng.normal(0, 2, outputs[i].shape)
+
+        params = [(0.05, 0), (1.0 / 255, -128)] * 3
+        quantized = [
+            np.clip(np.round(o / scale + zp), -128, 127).astype(np.int8)
+            for o, (scale, zp) in zip(outputs, params)
+        ]
+        dequantized = [(q.astype(np.float32) - zp) * scale for q, (scale, zp) in zip(quantized, params)]
+
+        expected = yolov8_postprocess(dequantized)
+        boxes, classes, scores = yolov8_postprocess(quantized, quant_params=params)
+        self.assertEqual(len(boxes), 2)
+        np.testing.assert_allclose(boxes, expected[0], atol=1e-3)
+        np.testing.assert_array_equal(classes, expected[1])
+        np.testing.assert_allclose(scores, expected[2], atol=1e-6)
+
+
+class TestDFL(unittest.TestCase):
+    """DFL 解码测试"""
+
+    def test_top3_matches_exact_on_peaked_distribution(self):
+        """测试近似解码：分布集中时与完整 softmax 结果一致"""
+        bins = np.arange(16, dtype=np.float32).reshape(1, 1, 16, 1, 1)
+        target = np.array([0, 5, 9, 15], dtype=np.float32).reshape(1, 4, 1, 1, 1)
+        logits = -4.0 * (bins - target) ** 2
+        logits = np.broadcast_to(logits, (1, 4, 16, 2, 3)).astype(np.float32)
+
+        exact = _dfl(logits.reshape(1, 64, 2, 3))
+        fast = _dfl_top3(logits)
+
+        self.assertEqual(fast.shape, (1, 4, 2, 3))
+        np.testing.assert_allclose(fast, exact, atol=1e-3)
+
+
 class TestNMSEdgeCases(unittest.TestCase):
     """NMS 边界情况测试"""
     
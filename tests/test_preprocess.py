@@ -53,6 +53,38 @@ class TestPreprocess(unittest.TestCase):
         # 高度 = 1080 * 0.333 = 360，pad_y = (640 - 360) / 2 = 140
         self.assertGreater(pad_y, 0)
     
+    def test_preprocess_keep_bgr(self):
+        """测试 swap_rb=False 时保持 BGR 顺序"""
+        img = np.zeros((100, 100, 3), dtype=np.uint8)
+        img[..., 0] = 255  # 纯蓝 (BGR)
+        
+        rgb = preprocess(img, (64, 64))
+        bgr = preprocess(img, (64, 64), swap_rb=False)
+        
+        self.assertTrue(np.all(rgb[..., 2] == 255))
+        self.assertTrue(np.all(bgr[..., 0] == 255))
+    
+    def test_letterbox_keep_bgr(self):
+        """测试 letterbox swap_rb=False 与 RGB 输出只差通道顺序"""
+        img = np.random.randint(0, 255, (360, 640, 3), dtype=np.uint8)
+        
+        rgb, _, _ = preprocess_with_letterbox(img, (640, 640), color=(10, 20, 30))
+        bgr, _, _ = preprocess_with_letterbox(img, (640, 640), color=(10, 20, 30), swap_rb=False)
+        
+        np.testing.assert_array_equal(rgb, bgr[..., ::-1])
+        np.testing.assert_array_equal(bgr[0, 0], [10, 20, 30])
+    
+    def test_letterbox_reuse_dst(self):
+        """测试复用输出画布与新分配结果一致"""
+        dst = np.zeros((640, 640, 3), dtype=np.uint8)
+        for _ in range(2):
+            img = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+            expected, _, _ = preprocess_with_letterbox(img, (640, 640))
+            result, _, _ = preprocess_with_letterbox(img, (640, 640), dst=dst)
+            
+            self.assertIs(result, dst)
+            np.testing.assert_array_equal(result, expected)
+    
     def test_restore_coords_basic(self):
         """测试坐标还原基本功能"""
         # 模拟 letterbox 参数